@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Kolkata Fatafat Analysis Cache
+==============================
+
+Bounded cache for the predictor's derived data (pattern snapshot,
+number-wise scores, statistics and round info).
+
+Features:
+- Typed keys: every entry belongs to one of the cache kinds below
+- Size (LRU) and TTL bounds
+- Dependency-based invalidation: a new draw drops patterns, scores and
+  statistics but keeps the round schedule
+- Hit/miss counters per kind
+- Pluggable backends: in-process memory or a directory of pickles, which
+  can live on local disk or in shared memory (/dev/shm) across workers
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# Cache kinds
+PATTERNS = 'patterns'
+NUMBER_WISE = 'number_wise'
+STATISTICS = 'statistics'
+ROUND_INFO = 'round_info'
+
+# Events and the kinds of entries they make stale
+DRAW = 'draw'
+SCHEDULE = 'schedule'
+DEPENDENCIES = {
+    DRAW: (PATTERNS, NUMBER_WISE, STATISTICS),
+    SCHEDULE: (ROUND_INFO,)
+}
+
+CacheKey = namedtuple('CacheKey', ['kind', 'params'])
+
+# Returned by backends on a miss, since None is a valid cached value
+MISS = object()
+
+
+class MemoryBackend:
+    """In-process LRU store"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return MISS
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                # Drop expired entries before evicting live ones
+                now = time.time()
+                for stale in [k for k, (expires, _) in self._entries.items() if expires is not None and expires <= now]:
+                    del self._entries[stale]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_kind(self, kind):
+        with self._lock:
+            for key in [key for key in self._entries if key.kind == kind]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DirectoryBackend:
+    """Pickle-per-entry store shared by every process that points at the same directory"""
+
+    def __init__(self, path, max_entries=256):
+        self.path = path
+        self.max_entries = max_entries
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key):
+        digest = hashlib.sha1(repr(key.params).encode()).hexdigest()[:16]
+        return os.path.join(self.path, f"{key.kind}-{digest}.pkl")
+
+    def get(self, key):
+        path = self._file(key)
+        try:
+            with open(path, 'rb') as f:
+                expires_at, stored_key, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return MISS
+        if stored_key != key:
+            return MISS
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(path)
+            return MISS
+        # Touch for LRU ordering
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key, value, expires_at):
+        fd, temp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((expires_at, key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Rename so other workers never read a partial entry
+        os.replace(temp_path, self._file(key))
+        self._prune()
+
+    def _entries(self):
+        return [name for name in os.listdir(self.path) if name.endswith('.pkl')]
+
+    def _prune(self):
+        names = self._entries()
+        if len(names) <= self.max_entries:
+            return
+        paths = [os.path.join(self.path, name) for name in names]
+        paths.sort(key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0)
+        for path in paths[:len(paths) - self.max_entries]:
+            self._remove(path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def delete_kind(self, kind):
+        for name in self._entries():
+            if name.startswith(kind + '-'):
+                self._remove(os.path.join(self.path, name))
+
+    def clear(self):
+        for name in self._entries():
+            self._remove(os.path.join(self.path, name))
+
+    def __len__(self):
+        return len(self._entries())
+
+
+class AnalysisCache:
+    def __init__(self, backend=None, default_ttl=None, ttls=None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+
+    def _count(self, counters, kind):
+        with self._lock:
+            counters[kind] = counters.get(kind, 0) + 1
+
+    def get(self, kind, *params):
+        """Return the cached value for (kind, params), or MISS"""
+        value = self.backend.get(CacheKey(kind, params))
+        self._count(self.misses if value is MISS else self.hits, kind)
+        return value
+
+    def set(self, kind, value, *params, ttl=None):
+        ttl = ttl if ttl is not None else self.ttls.get(kind, self.default_ttl)
+        expires_at = time.time() + ttl if ttl is not None else None
+        self.backend.set(CacheKey(kind, params), value, expires_at)
+        return value
+
+    def invalidate(self, *kinds):
+        for kind in kinds:
+            self.backend.delete_kind(kind)
+
+    def invalidate_for(self, event):
+        """Drop every entry made stale by an event (e.g. DRAW)"""
+        self.invalidate(*DEPENDENCIES[event])
+
+    def publish(self, kind, value, *params, event=DRAW):
+        """Replace one entry and invalidate the rest of what the event made stale
+
+        The new value is stored before its dependents are dropped, so readers
+        never find the published kind missing and fall back to recomputing it.
+        """
+        self.set(kind, value, *params)
+        self.invalidate(*(dependent for dependent in DEPENDENCIES[event] if dependent != kind))
+        return value
+
+    def clear(self):
+        self.backend.clear()
+
+    def get_stats(self):
+        with self._lock:
+            kinds = sorted(set(self.hits) | set(self.misses))
+            return {
+                'entries': len(self.backend),
+                'backend': type(self.backend).__name__,
+                'kinds': {kind: {'hits': self.hits.get(kind, 0), 'misses': self.misses.get(kind, 0)}
+                          for kind in kinds}
+            }
+
+
+def cache_from_environment():
+    """Build the app's cache from FATAFAT_CACHE_* environment variables"""
+    max_entries = int(os.environ.get('FATAFAT_CACHE_MAX_ENTRIES', 256))
+    cache_dir = os.environ.get('FATAFAT_CACHE_DIR')
+    if cache_dir:
+        backend = DirectoryBackend(cache_dir, max_entries=max_entries)
+    else:
+        backend = MemoryBackend(max_entries=max_entries)
+    default_ttl = os.environ.get('FATAFAT_CACHE_TTL')
+    return AnalysisCache(
+        backend,
+        default_ttl=float(default_ttl) if default_ttl else None,
+        # Round info is keyed by minute; it is never useful for longer. The
+        # pattern snapshot is only replaced by the refresh scheduler, so it must
+        # never expire and leave a request to rebuild it
+        ttls={ROUND_INFO: 60, PATTERNS: None}
+    )
@@ -9,115 +9,357 @@ based on historical data analysis and statistical patterns.
 
 from flask import Flask, render_template, jsonify, request
 import json
+import hashlib
 import numpy as np
 from datetime import datetime, timedelta
 import random
 from collections import Counter, defaultdict
 import os
+import threading
+from analysis_cache import (
+    MISS, NUMBER_WISE, PATTERNS, ROUND_INFO, STATISTICS, cache_from_environment
+)
+from context_model import DENSE_ORDER, ContextModel
+from draw_history import WEEKDAY_NAMES, DrawHistory
+from snapshot_export import exporter_from_environment
 
 app = Flask(__name__)
 
-class FatafatPredictor:
+# Seed for every generator the predictor uses; identical seed + history gives identical output
+DEFAULT_SEED = int(os.environ.get('FATAFAT_SEED', 0))
+
+# Public URL of FATAFAT_STATIC_DIR; when set, the web pages read the static snapshot
+STATIC_BASE_URL = os.environ.get('FATAFAT_STATIC_URL', '').rstrip('/')
+
+# Longest context (previous results) the sequence model conditions on, 3-6
+DEFAULT_CONTEXT_ORDER = int(os.environ.get('FATAFAT_CONTEXT_ORDER', DENSE_ORDER))
+
+# Modulus for the rolling snapshot fingerprint (a Mersenne prime)
+FINGERPRINT_MODULUS = 2 ** 61 - 1
+
+# Kolkata Fatafat schedule: 8 rounds daily, results announced every 1.5 hours
+# Round END times (when results are announced)
+RESULT_ANNOUNCEMENT_TIMES = ["10:30", "12:00", "13:30", "15:00", "16:30", "18:00", "19:30", "21:00"]
+
+# Rows of the per-slot tables: slot 1-8, with 0 for draws of unknown slot
+SLOT_ROWS = len(RESULT_ANNOUNCEMENT_TIMES) + 1
+WEEKDAY_CODES = {name: code for code, name in enumerate(WEEKDAY_NAMES)}
+
+# Factor weights used by get_number_wise_predictions. Kept in one place so the
+# backtester can sweep them without touching the scoring code.
+DEFAULT_WEIGHTS = {
+    'base': 5.0,            # Starting probability for every number
+    'frequency': 0.25,      # Factor 1: historical frequency
+    'recent': 20,           # Factor 2: recent trend bonus
+    'single': 0.3,          # Factor 3: single transition weight
+    'pair': 0.25,           # Factor 3: pair transition weight
+    'triple': 0.2,          # Factor 3: triple transition weight
+    'order_4': 0.15,        # Factor 3: sparse context weights, used when
+    'order_5': 0.1,         #   FATAFAT_CONTEXT_ORDER goes above 3
+    'order_6': 0.05,
+    'sequence_cap': 35,     # Factor 3: cap on the total sequence bonus
+    'hot': 10,              # Factor 4: hot number bonus
+    'cold': 5,              # Factor 4: cold number penalty
+    'hour': 8,              # Factor 5: time-based influence
+    'fibonacci': 3,         # Factor 6: mathematical pattern bonus
+    'slot': 0.1,            # Factor 7: frequency within the target draw slot
+    'slot_transition': 0.1, # Factor 7: what follows the last result in that slot
+    'weekday': 0.05,        # Factor 8: frequency on the target weekday
+    'weekday_transition': 0.05,  # Factor 8: what follows the last result on that weekday
+}
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one computation"""
+    
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+    
     def __init__(self):
-        self.historical_data = []
-        self.analysis_cache = {}
-        self.load_sample_data()
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.computations = 0
+        self.deduplicated = 0
+    
+    def do(self, key, compute):
+        """Run compute() for key, or wait for the caller already running it"""
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = self._Call()
+                self.computations += 1
+            else:
+                self.deduplicated += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = compute()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+    
+    def get_stats(self):
+        with self._lock:
+            return {
+                'computations': self.computations,
+                'duplicates_avoided': self.deduplicated,
+                'in_flight': len(self._in_flight)
+            }
+
+class FatafatPredictor:
+    def __init__(self, weights=None, historical_data=None, cache=None, seed=None, context_order=None):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.seed = DEFAULT_SEED if seed is None else seed
+        self.context_order = DEFAULT_CONTEXT_ORDER if context_order is None else context_order
+        self.historical_data = DrawHistory(slot_times=RESULT_ANNOUNCEMENT_TIMES)
+        self.analysis_cache = cache if cache is not None else cache_from_environment()
+        self.snapshot_version = 0
+        self._publish_lock = threading.Lock()
+        self.single_flight = SingleFlight()
+        if historical_data is None:
+            self.load_sample_data()
+        else:
+            self.historical_data = DrawHistory(historical_data, slot_times=RESULT_ANNOUNCEMENT_TIMES)
     
-    def load_sample_data(self):
+    def load_sample_data(self, days=30):
         """Load or generate sample historical data for predictions"""
         # Generate realistic sample data for demonstration
-        self.historical_data = []
+        self.historical_data = DrawHistory(slot_times=RESULT_ANNOUNCEMENT_TIMES)
         
-        # Generate last 30 days of data
-        for days_back in range(30, 0, -1):
+        # Generate last `days` days of data
+        for days_back in range(days, 0, -1):
             date = datetime.now() - timedelta(days=days_back)
             
-            # Generate 8 draws per day (4 on Sunday)
-            num_draws = 4 if date.weekday() == 6 else 8
-            
-            for draw in range(1, num_draws + 1):
+            for draw in range(1, self.draws_on(date) + 1):
                 # Generate realistic results with some patterns
-                result = self.generate_realistic_number()
+                result = self.generate_realistic_number(self.draw_rng(date, draw))
                 
-                self.historical_data.append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'time': f"{9 + draw}:30",
-                    'draw': draw,
-                    'result': result,
-                    'day_of_week': date.strftime('%A')
-                })
-    
-    def generate_realistic_number(self):
+                self.historical_data.append_draw(date.date(), draw, result)
+    
+    def fetch_result(self, date, draw):
+        """Fetch the announced result for a draw (sample data stands in for a live source)"""
+        return {
+            'date': date.strftime('%Y-%m-%d'),
+            'time': RESULT_ANNOUNCEMENT_TIMES[draw - 1],
+            'draw': draw,
+            'result': self.generate_realistic_number(self.draw_rng(date, draw)),
+            'day_of_week': date.strftime('%A')
+        }
+    
+    def draws_on(self, date):
+        """Number of draws held on a date: 8 per day (4 on Sunday)"""
+        return 4 if date.weekday() == 6 else 8
+    
+    def ingest_result(self, entry):
+        """Append a newly announced draw to the history"""
+        self.historical_data.append(entry)
+    
+    def draw_rng(self, date, draw):
+        """Generator for one sample draw, so every worker agrees on its result"""
+        return np.random.default_rng([self.seed, date.toordinal(), draw])
+    
+    def snapshot_rng(self, patterns, *salt):
+        """Generator seeded by the pattern snapshot, for reproducible per-snapshot output"""
+        return np.random.default_rng([self.seed, patterns['fingerprint'], *salt])
+    
+    def generate_realistic_number(self, rng):
         """Generate realistic lottery numbers with weighted probabilities"""
         # Some numbers are more common in real lottery data
-        weights = [8, 12, 10, 9, 11, 13, 9, 14, 12, 10]  # 0-9
-        return random.choices(range(10), weights=weights)[0]
+        weights = np.array([8, 12, 10, 9, 11, 13, 9, 14, 12, 10])  # 0-9
+        return int(rng.choice(10, p=weights / weights.sum()))
     
-    def analyze_patterns(self):
-        """Analyze patterns in historical data including sequence transitions"""
-        if 'patterns' in self.analysis_cache:
-            return self.analysis_cache['patterns']
-        
-        patterns = {
+    def new_patterns(self):
+        """Create an empty pattern snapshot that update_patterns can fill"""
+        return {
             'frequency': Counter(),
-            'time_patterns': defaultdict(list),
-            'day_patterns': defaultdict(list),
             'recent_trends': [],
             'hot_numbers': [],
             'cold_numbers': [],
             'single_transitions': defaultdict(Counter),  # What follows each number
             'pair_transitions': defaultdict(Counter),    # What follows each pair
-            'triple_transitions': defaultdict(Counter)   # What follows each triple
+            'triple_transitions': defaultdict(Counter),  # What follows each triple
+            # Dense copies of the transition counts, indexed by encoded context
+            'single_counts': np.zeros((10, 10)),
+            'pair_counts': np.zeros((100, 10)),
+            'triple_counts': np.zeros((1000, 10)),
+            # Precomputed (uncapped) sequence bonus for every (a, b, c) context -> number
+            'transition_bonus': np.zeros((1000, 10)),
+            # Sparse counts for contexts longer than three results
+            'context_model': ContextModel(self.context_order),
+            # Slot- and weekday-conditioned counts: [slot, number] and [slot, previous, number]
+            'slot_frequency': np.zeros((SLOT_ROWS, 10)),
+            'slot_transitions': np.zeros((SLOT_ROWS, 10, 10)),
+            'weekday_frequency': np.zeros((7, 10)),
+            'weekday_transitions': np.zeros((7, 10, 10)),
+            # Rolling hash of the result sequence, identifies the snapshot
+            'fingerprint': 0
         }
+    
+    def draw_slot(self, entry):
+        return entry.get('draw', 0) or 0
+    
+    def draw_weekday(self, entry):
+        return WEEKDAY_CODES.get(entry.get('day_of_week'), 0)
+    
+    def update_patterns(self, patterns, entry):
+        """Fold a single draw into a pattern snapshot in constant time"""
+        result = entry['result']
+        recent = patterns['recent_trends']
+        slot = self.draw_slot(entry)
+        weekday = self.draw_weekday(entry)
+        
+        patterns['slot_frequency'][slot, result] += 1
+        patterns['weekday_frequency'][weekday, result] += 1
+        
+        # Sequence transitions ending at this result
+        if len(recent) >= 1:
+            patterns['single_transitions'][recent[-1]][result] += 1
+            patterns['single_counts'][recent[-1], result] += 1
+            patterns['slot_transitions'][slot, recent[-1], result] += 1
+            patterns['weekday_transitions'][weekday, recent[-1], result] += 1
+        if len(recent) >= 2:
+            patterns['pair_transitions'][(recent[-2], recent[-1])][result] += 1
+            patterns['pair_counts'][recent[-2] * 10 + recent[-1], result] += 1
+        if len(recent) >= 3:
+            patterns['triple_transitions'][(recent[-3], recent[-2], recent[-1])][result] += 1
+            patterns['triple_counts'][recent[-3] * 100 + recent[-2] * 10 + recent[-1], result] += 1
+        if len(recent) >= 1:
+            self.refresh_transition_bonus(patterns, recent[-1])
+        patterns['context_model'].update(recent, result)
+        
+        patterns['frequency'][result] += 1
+        patterns['fingerprint'] = (patterns['fingerprint'] * 1000003 + result + 1) % FINGERPRINT_MODULUS
+        
+        # Keep only the last 10 results as recent trends
+        recent.append(result)
+        if len(recent) > 10:
+            del recent[0]
+        
+        # Identify hot and cold numbers
+        freq_items = patterns['frequency'].most_common()
+        patterns['hot_numbers'] = [num for num, count in freq_items[:3]]
+        patterns['cold_numbers'] = [num for num, count in freq_items[-3:]]
+        return patterns
+    
+    def build_patterns(self):
+        """Build a fresh pattern snapshot from the full history in one grouped pass"""
+        history = self.historical_data
+        patterns = self.new_patterns()
+        if not len(history):
+            return patterns
+        
+        # Column views up to the current length; draws appended meanwhile are not seen
+        results = history.results.astype(np.int64)
+        count = len(results)
+        slots = history.slots[:count].astype(np.int64)
+        weekdays = history.weekdays[:count].astype(np.int64)
+        previous, following = results[:-1], results[1:]
+        
+        # Global, per-slot and per-weekday counts, all grouped by encoded key
+        patterns['slot_frequency'] = np.bincount(slots * 10 + results, minlength=SLOT_ROWS * 10).reshape(SLOT_ROWS, 10).astype(float)
+        patterns['weekday_frequency'] = np.bincount(weekdays * 10 + results, minlength=70).reshape(7, 10).astype(float)
+        patterns['slot_transitions'] = np.bincount(slots[1:] * 100 + previous * 10 + following,
+                                                   minlength=SLOT_ROWS * 100).reshape(SLOT_ROWS, 10, 10).astype(float)
+        patterns['weekday_transitions'] = np.bincount(weekdays[1:] * 100 + previous * 10 + following,
+                                                      minlength=700).reshape(7, 10, 10).astype(float)
+        
+        single_codes = previous * 10 + following
+        pair_codes = (results[:-2] * 10 + results[1:-1]) * 10 + results[2:]
+        triple_codes = (results[:-3] * 100 + results[1:-2] * 10 + results[2:-1]) * 10 + results[3:]
+        patterns['single_counts'] = np.bincount(single_codes, minlength=100).reshape(10, 10).astype(float)
+        patterns['pair_counts'] = np.bincount(pair_codes, minlength=1000).reshape(100, 10).astype(float)
+        patterns['triple_counts'] = np.bincount(triple_codes, minlength=10000).reshape(1000, 10).astype(float)
+        
+        # Counter views, filled in order of first appearance so ties rank as
+        # they would have if the draws were counted one at a time
+        def first_seen_counts(codes):
+            unique, first_index, counts = np.unique(codes, return_index=True, return_counts=True)
+            order = np.argsort(first_index, kind='stable')
+            return zip(unique[order].tolist(), counts[order].tolist())
+        
+        for num, count in first_seen_counts(results):
+            patterns['frequency'][num] = count
+        for code, count in first_seen_counts(single_codes):
+            patterns['single_transitions'][code // 10][code % 10] = count
+        for code, count in first_seen_counts(pair_codes):
+            patterns['pair_transitions'][(code // 100, code // 10 % 10)][code % 10] = count
+        for code, count in first_seen_counts(triple_codes):
+            patterns['triple_transitions'][(code // 1000, code // 100 % 10, code // 10 % 10)][code % 10] = count
+        
+        self.refresh_transition_bonus(patterns)
+        patterns['context_model'].build(results)
         
-        # Analyze frequency and build sequence data
-        sequence_data = []
-        for entry in self.historical_data:
-            result = entry['result']
-            patterns['frequency'][result] += 1
-            patterns['time_patterns'][entry['time']].append(result)
-            patterns['day_patterns'][entry['day_of_week']].append(result)
-            sequence_data.append(result)
-        
-        # Analyze single number transitions (what comes after each number)
-        for i in range(len(sequence_data) - 1):
-            current_num = sequence_data[i]
-            next_num = sequence_data[i + 1]
-            patterns['single_transitions'][current_num][next_num] += 1
-        
-        # Analyze pair transitions (what comes after each pair of numbers)
-        for i in range(len(sequence_data) - 2):
-            pair = (sequence_data[i], sequence_data[i + 1])
-            next_num = sequence_data[i + 2]
-            patterns['pair_transitions'][pair][next_num] += 1
-        
-        # Analyze triple transitions (what comes after each triple)
-        for i in range(len(sequence_data) - 3):
-            triple = (sequence_data[i], sequence_data[i + 1], sequence_data[i + 2])
-            next_num = sequence_data[i + 3]
-            patterns['triple_transitions'][triple][next_num] += 1
-        
-        # Get recent trends (last 10 results)
-        patterns['recent_trends'] = sequence_data[-10:] if sequence_data else []
+        fingerprint = 0
+        for result in results.tolist():
+            fingerprint = (fingerprint * 1000003 + result + 1) % FINGERPRINT_MODULUS
+        patterns['fingerprint'] = fingerprint
+        patterns['recent_trends'] = results[-10:].tolist()
         
         # Identify hot and cold numbers
         freq_items = patterns['frequency'].most_common()
         patterns['hot_numbers'] = [num for num, count in freq_items[:3]]
         patterns['cold_numbers'] = [num for num, count in freq_items[-3:]]
+        return patterns
+    
+    def analyze_patterns(self):
+        """Analyze patterns in historical data including sequence transitions"""
+        version = self.snapshot_version
+        patterns = self.analysis_cache.get(PATTERNS)
+        if patterns is not MISS:
+            return patterns
         
-        self.analysis_cache['patterns'] = patterns
+        def compute():
+            return self.cache_result(PATTERNS, version, self.build_patterns())
+        
+        return self.single_flight.do((PATTERNS, version), compute)
+    
+    def cache_result(self, kind, version, value, *params):
+        """Cache a value computed from snapshot `version` unless a newer one was published meanwhile"""
+        with self._publish_lock:
+            if version == self.snapshot_version:
+                self.analysis_cache.set(kind, value, *params)
+        return value
+    
+    def refresh_snapshot(self):
+        """Rebuild the pattern snapshot off the request path and publish it atomically"""
+        patterns = self.build_patterns()
+        with self._publish_lock:
+            # The new patterns replace the old entry in one step; only the cheap
+            # derived entries (scores, statistics) are dropped and recomputed
+            self.analysis_cache.publish(PATTERNS, patterns)
+            self.snapshot_version += 1
         return patterns
     
     def get_current_round_info(self):
         """Get information about the current round"""
         now = datetime.now()
+        # Everything below has minute resolution
+        key = (now.strftime('%Y-%m-%d %H:%M'),)
+        round_info = self.analysis_cache.get(ROUND_INFO, *key)
+        if round_info is MISS:
+            round_info = self.analysis_cache.set(ROUND_INFO, self.compute_round_info(now), *key)
+        return round_info
+    
+    def compute_round_info(self, now):
+        """Work out the current/next draw from the result schedule"""
         current_time = now.strftime('%H:%M')
         current_hour = now.hour
         current_minute = now.minute
         
-        # Kolkata Fatafat schedule: 8 rounds daily, results announced every 1.5 hours
-        # Round END times (when results are announced): 10:30, 12:00, 13:30, 15:00, 16:30, 18:00, 19:30, 21:00
-        result_announcement_times = ["10:30", "12:00", "13:30", "15:00", "16:30", "18:00", "19:30", "21:00"]
+        result_announcement_times = RESULT_ANNOUNCEMENT_TIMES
         
         # Find current or next draw
         current_draw = None
@@ -143,6 +385,8 @@ class FatafatPredictor:
                 draw_number = idx + 1
                 break
         
+        draw_date = now
+        
         # If no more draws today, show next day's first draw
         if not next_draw_time and not current_draw:
             next_draw_time = "10:30"
@@ -153,8 +397,10 @@ class FatafatPredictor:
             hours = time_diff.seconds // 3600
             minutes = (time_diff.seconds % 3600) // 60
             time_to_next = f"{hours}h {minutes}m"
+            draw_date = tomorrow
         
         return {
+            'draw_date': draw_date.strftime('%Y-%m-%d'),
             'current_time': current_time,
             'current_draw': current_draw,
             'next_draw_time': next_draw_time,
@@ -163,8 +409,41 @@ class FatafatPredictor:
             'total_draws_today': len(result_announcement_times)
         }
     
+    def refresh_transition_bonus(self, patterns, last_num=None):
+        """Rebuild the bonus rows for every context ending in last_num (or all of them)"""
+        # A draw after (x, y, z) changes the single counts of z, so the 100
+        # contexts (a, b, z) are the only rows whose bonus can move
+        if last_num is None:
+            contexts = np.arange(1000)
+        else:
+            contexts = np.arange(100) * 10 + last_num
+        bonus = np.zeros((len(contexts), 10))
+        for counts, weight in ((patterns['single_counts'][contexts % 10], self.weights['single']),
+                               (patterns['pair_counts'][contexts % 100], self.weights['pair']),
+                               (patterns['triple_counts'][contexts], self.weights['triple'])):
+            totals = counts.sum(axis=1, keepdims=True)
+            probability = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0) * 100
+            bonus += probability * weight
+        patterns['transition_bonus'][contexts] = bonus
+    
+    def get_sequence_transition_bonuses(self, patterns):
+        """Return the sequence bonus for every number (0-9) given the recent trends"""
+        recent_trends = patterns['recent_trends']
+        if len(recent_trends) >= 3:
+            context = recent_trends[-3] * 100 + recent_trends[-2] * 10 + recent_trends[-1]
+            bonus = patterns['transition_bonus'][context]
+            # Longer contexts add on top, as far as they are well supported
+            for order, counts in patterns['context_model'].rows(recent_trends):
+                bonus = bonus + np.array(counts[:10]) / counts[10] * 100 * self.weights[f'order_{order}']
+            return np.minimum(bonus, self.weights['sequence_cap']).tolist()
+        return [self.compute_sequence_transition_bonus(patterns, num) for num in range(10)]
+    
     def get_sequence_transition_bonus(self, patterns, target_num):
         """Calculate bonus based on sequence transition patterns"""
+        return self.get_sequence_transition_bonuses(patterns)[target_num]
+    
+    def compute_sequence_transition_bonus(self, patterns, target_num):
+        """Calculate bonus from the transition counters without the lookup table"""
         recent_trends = patterns['recent_trends']
         if not recent_trends:
             return 0
@@ -180,7 +459,7 @@ class FatafatPredictor:
                 target_count = single_transitions.get(target_num, 0)
                 if target_count > 0:
                     single_probability = (target_count / total_occurrences) * 100
-                    total_bonus += single_probability * 0.3  # 30% weight for single transitions
+                    total_bonus += single_probability * self.weights['single']  # 30% weight for single transitions
         
         # Pair transition (what comes after last two numbers)
         if len(recent_trends) >= 2:
@@ -191,7 +470,7 @@ class FatafatPredictor:
                 target_count = pair_transitions.get(target_num, 0)
                 if target_count > 0:
                     pair_probability = (target_count / total_occurrences) * 100
-                    total_bonus += pair_probability * 0.25  # 25% weight for pair transitions
+                    total_bonus += pair_probability * self.weights['pair']  # 25% weight for pair transitions
         
         # Triple transition (what comes after last three numbers)
         if len(recent_trends) >= 3:
@@ -202,16 +481,35 @@ class FatafatPredictor:
                 target_count = triple_transitions.get(target_num, 0)
                 if target_count > 0:
                     triple_probability = (target_count / total_occurrences) * 100
-                    total_bonus += triple_probability * 0.2  # 20% weight for triple transitions
+                    total_bonus += triple_probability * self.weights['triple']  # 20% weight for triple transitions
         
-        return min(total_bonus, 35)  # Cap at 35% bonus
+        return min(total_bonus, self.weights['sequence_cap'])  # Cap at 35% bonus
     
-    def get_number_wise_predictions(self):
-        """Calculate probability for each number (0-9) based on historical analysis including sequence patterns"""
-        patterns = self.analyze_patterns()
+    def get_conditional_bonuses(self, patterns, slot=None, weekday=None):
+        """Bonus for each number from the tables conditioned on the target slot and weekday"""
+        bonus = np.zeros(10)
+        recent_trends = patterns['recent_trends']
+        rows = []
+        if slot:
+            rows.append((patterns['slot_frequency'][slot], self.weights['slot']))
+            if recent_trends:
+                rows.append((patterns['slot_transitions'][slot, recent_trends[-1]], self.weights['slot_transition']))
+        if weekday is not None:
+            rows.append((patterns['weekday_frequency'][weekday], self.weights['weekday']))
+            if recent_trends:
+                rows.append((patterns['weekday_transitions'][weekday, recent_trends[-1]], self.weights['weekday_transition']))
+        for counts, weight in rows:
+            total = counts.sum()
+            if total > 0:
+                bonus += (counts / total) * 100 * weight
+        return bonus.tolist()
+    
+    def score_numbers(self, patterns, now=None, slot=None, weekday=None):
+        """Score each number (0-9) against a pattern snapshot, returning percentages"""
+        weights = self.weights
         
         # Initialize base probabilities
-        number_probabilities = {i: 5.0 for i in range(10)}  # Start with lower base (5% each)
+        number_probabilities = {i: float(weights['base']) for i in range(10)}  # Start with lower base (5% each)
         
         # Factor 1: Historical frequency (reduced weight to make room for sequence analysis)
         total_occurrences = sum(patterns['frequency'].values())
@@ -219,20 +517,20 @@ class FatafatPredictor:
             for num in range(10):
                 freq = patterns['frequency'].get(num, 0)
                 frequency_weight = (freq / total_occurrences) * 100
-                number_probabilities[num] += frequency_weight * 0.25  # Reduced to 25% weight
+                number_probabilities[num] += frequency_weight * weights['frequency']  # Reduced to 25% weight
         
         # Factor 2: Recent trend analysis (reduced weight)
         recent_trends = patterns['recent_trends'][-5:] if patterns['recent_trends'] else []
         for num in range(10):
             recent_count = recent_trends.count(num)
             if recent_count > 0:
-                recent_bonus = (recent_count / len(recent_trends)) * 20  # Reduced to 20%
+                recent_bonus = (recent_count / len(recent_trends)) * weights['recent']  # Reduced to 20%
                 number_probabilities[num] += recent_bonus
         
         # Factor 3: NEW - Sequence Transition Analysis (Major Factor - 35% max)
+        sequence_bonuses = self.get_sequence_transition_bonuses(patterns)
         for num in range(10):
-            sequence_bonus = self.get_sequence_transition_bonus(patterns, num)
-            number_probabilities[num] += sequence_bonus
+            number_probabilities[num] += sequence_bonuses[num]
         
         # Factor 4: Hot/Cold number analysis (reduced)
         hot_numbers = patterns['hot_numbers'][:3] if patterns['hot_numbers'] else []
@@ -241,15 +539,15 @@ class FatafatPredictor:
         for num in range(10):
             # Hot number bonus (reduced)
             if num in hot_numbers:
-                number_probabilities[num] += 10
+                number_probabilities[num] += weights['hot']
             
             # Cold number penalty (reduced)
             if num in cold_numbers:
-                number_probabilities[num] -= 5
+                number_probabilities[num] -= weights['cold']
         
         # Factor 5: Time-based patterns (reduced)
-        now = datetime.now()
-        hour_factor = (now.hour % 10) / 10 * 8  # Reduced to 8% max influence
+        now = now or datetime.now()
+        hour_factor = (now.hour % 10) / 10 * weights['hour']  # Reduced to 8% max influence
         for num in range(10):
             if num == (now.hour % 10):
                 number_probabilities[num] += hour_factor
@@ -257,7 +555,12 @@ class FatafatPredictor:
         # Factor 6: Mathematical pattern bonus (reduced)
         for num in range(10):
             if num in [1, 2, 3, 5, 8]:  # Fibonacci-like
-                number_probabilities[num] += 3
+                number_probabilities[num] += weights['fibonacci']
+        
+        # Factor 7/8: Slot- and weekday-conditioned patterns for the target draw
+        conditional_bonuses = self.get_conditional_bonuses(patterns, slot, weekday)
+        for num in range(10):
+            number_probabilities[num] += conditional_bonuses[num]
         
         # Ensure minimum and maximum bounds
         for num in range(10):
@@ -269,6 +572,35 @@ class FatafatPredictor:
             for num in range(10):
                 number_probabilities[num] = (number_probabilities[num] / total_prob) * 100
         
+        return number_probabilities
+    
+    def get_number_wise_predictions(self):
+        """Calculate probability for each number (0-9) based on historical analysis including sequence patterns"""
+        now = datetime.now()
+        round_info = self.get_current_round_info()
+        slot = round_info['draw_number']
+        weekday = datetime.strptime(round_info['draw_date'], '%Y-%m-%d').weekday()
+        patterns = self.analyze_patterns()
+        # Scores only change with the snapshot, the hour (Factor 5) and the target draw (Factor 7/8).
+        # The snapshot is named by its fingerprint, which every worker agrees on, so a
+        # late write from old patterns never lands under the new snapshot's key
+        key = (patterns['fingerprint'], now.strftime('%Y-%m-%d'), now.hour, round_info['draw_date'], slot)
+        number_wise = self.analysis_cache.get(NUMBER_WISE, *key)
+        if number_wise is not MISS:
+            return number_wise
+        
+        def compute():
+            number_wise = self.compute_number_wise_predictions(now, slot, weekday, patterns=patterns)
+            return self.analysis_cache.set(NUMBER_WISE, number_wise, *key)
+        
+        return self.single_flight.do((NUMBER_WISE,) + key, compute)
+    
+    def compute_number_wise_predictions(self, now=None, slot=None, weekday=None, patterns=None):
+        """Run the full scoring pipeline against a snapshot (the current one by default)"""
+        if patterns is None:
+            patterns = self.analyze_patterns()
+        number_probabilities = self.score_numbers(patterns, now=now, slot=slot, weekday=weekday)
+        
         # Sort by probability
         sorted_predictions = sorted(number_probabilities.items(), key=lambda x: x[1], reverse=True)
         
@@ -357,38 +689,67 @@ class FatafatPredictor:
             'number_wise_predictions': number_wise
         }
     
-    def calculate_smart_prediction(self, patterns, draw_offset):
+    def next_draw(self, now):
+        """(announcement datetime, draw number) of the first draw announced after now"""
+        day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        while True:
+            for draw in range(1, self.draws_on(day) + 1):
+                hour, minute = map(int, RESULT_ANNOUNCEMENT_TIMES[draw - 1].split(':'))
+                announcement = day.replace(hour=hour, minute=minute)
+                if announcement > now:
+                    return announcement, draw
+            day += timedelta(days=1)
+    
+    def get_draw_prediction(self, draw_at, draw_number):
+        """Prediction for one scheduled draw, with no fields that depend on the current time"""
+        patterns = self.analyze_patterns()
+        # Factor 5 uses the draw's own hour, so the result only depends on the snapshot
+        number_wise = self.compute_number_wise_predictions(draw_at, draw_number, draw_at.weekday())
+        prediction = number_wise['top_prediction']
+        return {
+            'predicted_number': prediction,
+            'confidence': number_wise['top_probability'],
+            'method': self.get_prediction_method(patterns, prediction),
+            'draw_date': draw_at.strftime('%Y-%m-%d'),
+            'target_time': draw_at.strftime('%H:%M'),
+            'draw_number': draw_number,
+            'number_wise_predictions': number_wise
+        }
+    
+    def calculate_smart_prediction(self, patterns, draw_offset, rng=None):
         """Calculate prediction using multiple algorithms"""
+        rng = rng or self.snapshot_rng(patterns, draw_offset)
         methods = []
         
         # Method 1: Frequency-based prediction
         if patterns['hot_numbers']:
-            methods.append(random.choice(patterns['hot_numbers']))
+            methods.append(patterns['hot_numbers'][rng.integers(len(patterns['hot_numbers']))])
         
         # Method 2: Pattern-based prediction
         recent = patterns['recent_trends']
         if len(recent) >= 3:
             # Look for patterns in recent results
             if recent[-1] == recent[-2]:  # If last two are same, predict different
-                methods.append((recent[-1] + random.randint(1, 5)) % 10)
+                methods.append((recent[-1] + int(rng.integers(1, 6))) % 10)
             else:
                 methods.append(recent[-1])  # Follow last trend
         
         # Method 3: Mathematical sequence
         if recent:
             avg = sum(recent) / len(recent)
-            methods.append(int(avg + random.randint(-2, 2)) % 10)
+            methods.append(int(avg + int(rng.integers(-2, 3))) % 10)
         
         # Method 4: Random with bias toward middle numbers
-        methods.append(random.choice([2, 3, 4, 5, 6, 7]))
+        methods.append(int(rng.integers(2, 8)))
         
         # Choose final prediction
         if methods:
-            return random.choice(methods)
-        return random.randint(0, 9)
+            return methods[rng.integers(len(methods))]
+        return int(rng.integers(0, 10))
     
-    def calculate_confidence(self, patterns, prediction):
+    def calculate_confidence(self, patterns, prediction, rng=None):
         """Calculate confidence score for prediction"""
+        rng = rng or self.snapshot_rng(patterns, prediction)
         confidence = 50  # Base confidence
         
         # Increase confidence if prediction is a hot number
@@ -400,7 +761,7 @@ class FatafatPredictor:
             confidence += 15
         
         # Add some randomness
-        confidence += random.randint(-10, 10)
+        confidence += int(rng.integers(-10, 11))
         
         return min(max(confidence, 30), 85)  # Keep between 30-85%
     
@@ -416,8 +777,17 @@ class FatafatPredictor:
     def get_statistics(self):
         """Get overall statistics"""
         patterns = self.analyze_patterns()
+        # Keyed by the snapshot's fingerprint, like the number-wise scores
+        stats = self.analysis_cache.get(STATISTICS, patterns['fingerprint'])
+        if stats is MISS:
+            stats = self.analysis_cache.set(STATISTICS, self.compute_statistics(patterns), patterns['fingerprint'])
+        return stats
+    
+    def compute_statistics(self, patterns=None):
+        if patterns is None:
+            patterns = self.analyze_patterns()
         
-        total_draws = len(self.historical_data)
+        total_draws = sum(patterns['frequency'].values())
         
         stats = {
             'total_draws_analyzed': total_draws,
@@ -429,28 +799,161 @@ class FatafatPredictor:
         
         return stats
 
+class RefreshScheduler:
+    """Background thread that ingests each result as it is announced and
+    republishes the predictor snapshot, so requests never pay for a rebuild"""
+    
+    def __init__(self, predictor, jitter_seconds=30, max_retries=5, retry_delay=5, exporter=None):
+        self.predictor = predictor
+        self.exporter = exporter
+        self.jitter_seconds = jitter_seconds
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.refreshes = 0
+        self.failures = 0
+        self.last_refresh = None
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        # One refresh at a time, so concurrent callers never ingest the same draw twice
+        self._refresh_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+    
+    def announced_since_last(self, now):
+        """Yield (date, draw) for every draw announced after the last one in the history"""
+        history = self.predictor.historical_data
+        if len(history):
+            # A process preloaded days ago (e.g. the Gunicorn master) catches up from there
+            last_day = datetime.fromordinal(int(history.days[-1]))
+            last_draw = int(history.slots[-1])
+        else:
+            last_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            last_draw = 0
+        
+        day = last_day
+        while day <= now:
+            for draw in range(1, self.predictor.draws_on(day) + 1):
+                if day == last_day and draw <= last_draw:
+                    continue
+                hour, minute = map(int, RESULT_ANNOUNCEMENT_TIMES[draw - 1].split(':'))
+                if day.replace(hour=hour, minute=minute) > now:
+                    return
+                yield day, draw
+            day += timedelta(days=1)
+    
+    def ingest_announced(self, now):
+        """Ingest every draw announced up to now that is not in the history yet"""
+        ingested = 0
+        for day, draw in list(self.announced_since_last(now)):
+            self.predictor.ingest_result(self.predictor.fetch_result(day, draw))
+            ingested += 1
+        return ingested
+    
+    def refresh(self):
+        """Ingest new results and republish the snapshot, retrying with backoff"""
+        with self._refresh_lock:
+            return self._refresh()
+    
+    def _refresh(self):
+        delay = self.retry_delay
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                ingested = self.ingest_announced(datetime.now())
+                self.predictor.refresh_snapshot()
+                self.refreshes += 1
+                self.last_refresh = datetime.now()
+                print(f"Snapshot refreshed ({ingested} new results, {len(self.predictor.historical_data)} draws)")
+                self.export()
+                return True
+            except Exception as e:
+                self.failures += 1
+                print(f"Snapshot refresh failed (attempt {attempt}/{self.max_retries}): {str(e)}")
+                if self._stopped.wait(delay):
+                    return False
+                delay *= 2
+        return False
+    
+    def export(self):
+        """Write the fresh snapshot to the static directory, if one is configured"""
+        if self.exporter is None:
+            return
+        try:
+            manifest = self.exporter.export(self.predictor, RESULT_ANNOUNCEMENT_TIMES)
+            print(f"Static snapshot exported to {self.exporter.directory} (version {manifest['snapshot_version']})")
+        except Exception as e:
+            # The live API keeps serving; the next refresh tries again
+            self.exporter.failures += 1
+            print(f"Static snapshot export failed: {str(e)}")
+    
+    def trigger(self):
+        """Ask for an immediate background refresh"""
+        if self._thread is not None and self._thread.is_alive():
+            self._wakeup.set()
+        else:
+            # Not running yet (e.g. flask run); starting it refreshes right away
+            self.start()
+    
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._run, name='refresh-scheduler', daemon=True)
+                self._thread.start()
+    
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+    
+    def _run(self):
+        # Catch up on anything announced before the process started
+        self.refresh()
+        while not self._stopped.is_set():
+            now = datetime.now()
+            # Jitter keeps workers and the upstream source from being hit in lockstep
+            # Same schedule as the catch-up and the exporter (no late draws on Sunday)
+            wake_at = self.predictor.next_draw(now)[0] + timedelta(seconds=random.uniform(0, self.jitter_seconds))
+            self._wakeup.wait((wake_at - now).total_seconds())
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            self.refresh()
+
 # Initialize predictor
 predictor = FatafatPredictor()
+# Warm the pattern snapshot at import so preforked workers inherit it
+predictor.analyze_patterns()
+refresh_scheduler = RefreshScheduler(predictor, exporter=exporter_from_environment())
+
+def etag_response(payload):
+    """JSON response with a weak ETag over the payload, answering 304 when the client has it"""
+    # The timestamp is added after hashing so identical predictions share an ETag
+    etag = hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(dict(payload, timestamp=datetime.now().isoformat()))
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/')
 def index():
     """Main page"""
-    return render_template('index.html')
+    return render_template('index.html', snapshot_base_url=STATIC_BASE_URL)
 
 @app.route('/mobile')
 def mobile():
     """Mobile app page"""
-    return render_template('mobile.html')
+    return render_template('mobile.html', snapshot_base_url=STATIC_BASE_URL)
 
 @app.route('/api/current-prediction')
 def get_current_prediction():
     """API endpoint for current round prediction"""
     try:
         prediction = predictor.get_current_prediction()
-        return jsonify({
+        return etag_response({
             'success': True,
-            'prediction': prediction,
-            'timestamp': datetime.now().isoformat()
+            'prediction': prediction
         })
     except Exception as e:
         return jsonify({
@@ -464,11 +967,10 @@ def get_number_wise_predictions():
     try:
         number_wise = predictor.get_number_wise_predictions()
         round_info = predictor.get_current_round_info()
-        return jsonify({
+        return etag_response({
             'success': True,
             'number_wise_predictions': number_wise,
-            'round_info': round_info,
-            'timestamp': datetime.now().isoformat()
+            'round_info': round_info
         })
     except Exception as e:
         return jsonify({
@@ -481,7 +983,7 @@ def get_statistics():
     """API endpoint for statistics"""
     try:
         stats = predictor.get_statistics()
-        return jsonify({
+        return etag_response({
             'success': True,
             'statistics': stats
         })
@@ -491,15 +993,31 @@ def get_statistics():
             'error': str(e)
         }), 500
 
+@app.route('/api/metrics')
+def get_metrics():
+    """API endpoint for snapshot and request-coalescing counters"""
+    return jsonify({
+        'success': True,
+        'snapshot_version': predictor.snapshot_version,
+        'single_flight': predictor.single_flight.get_stats(),
+        'cache': predictor.analysis_cache.get_stats(),
+        'refresh_scheduler': {
+            'refreshes': refresh_scheduler.refreshes,
+            'failures': refresh_scheduler.failures,
+            'last_refresh': refresh_scheduler.last_refresh.isoformat() if refresh_scheduler.last_refresh else None
+        },
+        'static_export': refresh_scheduler.exporter.get_stats() if refresh_scheduler.exporter else None
+    })
+
 @app.route('/api/refresh')
 def refresh_data():
     """Refresh predictions and data"""
     try:
-        # Clear cache to force new analysis
-        predictor.analysis_cache = {}
+        # Rebuild in the background; requests keep reading the current snapshot
+        refresh_scheduler.trigger()
         return jsonify({
             'success': True,
-            'message': 'Data refreshed successfully'
+            'message': 'Refresh scheduled; new predictions are published once it finishes'
         })
     except Exception as e:
         return jsonify({
@@ -512,4 +1030,5 @@ if __name__ == '__main__':
     print("Access the app at: http://localhost:5000")
     # Use environment port for deployment, fallback to 5000 for local
     port = int(os.environ.get('PORT', 5000))
+    refresh_scheduler.start()
     app.run(debug=False, host='0.0.0.0', port=port)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Kolkata Fatafat Walk-Forward Backtester
+=======================================
+
+Replays historical draws one at a time and measures how the prediction
+model in app.py would have scored. The pattern snapshot is updated
+incrementally after every draw, so a full replay is linear in the length
+of the history instead of re-running analyze_patterns at each step.
+
+Features:
+- Streaming replay with incremental pattern counters
+- Per-step predicted distribution, top-1/top-3 hits and log-loss
+- Parallel parameter sweeps over the factor weights across processes
+"""
+
+import argparse
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from app import DEFAULT_WEIGHTS, FatafatPredictor
+
+# Probability floor used when scoring log-loss, so a zero never explodes
+MIN_PROBABILITY = 1e-12
+
+# Stand-in announcement time for draws without a usable date, so Factor 5
+# never falls back to the wall clock
+UNKNOWN_DRAW_TIME = datetime.min
+
+# History shared with sweep worker processes (set once per worker)
+_worker_history = None
+
+
+def draw_datetime(entry):
+    """Return the datetime at which a historical draw was announced
+    
+    Draws with an unknown slot/time fall back to midnight of their date.
+    """
+    try:
+        return datetime.strptime(f"{entry['date']} {entry['time']}", '%Y-%m-%d %H:%M')
+    except (KeyError, TypeError, ValueError):
+        pass
+    try:
+        return datetime.strptime(str(entry['date']), '%Y-%m-%d')
+    except (KeyError, ValueError):
+        return None
+
+
+class WalkForwardBacktester:
+    def __init__(self, history, weights=None, warmup=50, record_steps=True, context_order=None):
+        self.history = history
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.warmup = warmup
+        self.record_steps = record_steps
+        self.context_order = context_order
+
+    def run(self):
+        """Replay the history draw-by-draw and score every prediction"""
+        predictor = FatafatPredictor(weights=self.weights, historical_data=[], context_order=self.context_order)
+        patterns = predictor.new_patterns()
+
+        steps = []
+        scored = 0
+        top1_hits = 0
+        top3_hits = 0
+        total_log_loss = 0.0
+
+        for index, entry in enumerate(self.history):
+            if index >= self.warmup:
+                # Predict the upcoming draw using only what came before it
+                drawn_at = draw_datetime(entry)
+                probabilities = predictor.score_numbers(patterns, now=drawn_at or UNKNOWN_DRAW_TIME, slot=entry.get('draw'),
+                                                        weekday=drawn_at.weekday() if drawn_at else None)
+                ranked = sorted(probabilities, key=probabilities.get, reverse=True)
+                actual = entry['result']
+
+                top1 = ranked[0] == actual
+                top3 = actual in ranked[:3]
+                log_loss = -math.log(max(probabilities[actual] / 100, MIN_PROBABILITY))
+
+                scored += 1
+                top1_hits += top1
+                top3_hits += top3
+                total_log_loss += log_loss
+
+                if self.record_steps:
+                    steps.append({
+                        'date': entry.get('date'),
+                        'time': entry.get('time'),
+                        'actual': actual,
+                        'distribution': [probabilities[num] for num in range(10)],
+                        'top_prediction': ranked[0],
+                        'top1_hit': top1,
+                        'top3_hit': top3,
+                        'log_loss': log_loss
+                    })
+
+            # Only now does the model get to see the result
+            predictor.update_patterns(patterns, entry)
+
+        return {
+            'weights': self.weights,
+            'draws': len(self.history),
+            'scored_draws': scored,
+            'top1_hit_rate': top1_hits / scored if scored else 0.0,
+            'top3_hit_rate': top3_hits / scored if scored else 0.0,
+            'mean_log_loss': total_log_loss / scored if scored else 0.0,
+            'steps': steps
+        }
+
+
+def weight_grid(**axes):
+    """Build weight configs from the cartesian product of per-factor values"""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def _init_sweep_worker(history):
+    global _worker_history
+    _worker_history = history
+
+
+def _run_sweep_config(args):
+    weights, warmup, context_order = args
+    return WalkForwardBacktester(_worker_history, weights, warmup=warmup, record_steps=False,
+                                 context_order=context_order).run()
+
+
+def run_weight_sweep(history, weight_configs, warmup=50, workers=None, context_order=None):
+    """Backtest many weight configs in parallel, best (lowest log-loss) first"""
+    tasks = [(weights, warmup, context_order) for weights in weight_configs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                             initargs=(history,)) as executor:
+        results = list(executor.map(_run_sweep_config, tasks, chunksize=max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))))
+    return sorted(results, key=lambda result: result['mean_log_loss'])
+
+
+def main():
+    """Backtest the default weights and an example sweep on sample history"""
+    parser = argparse.ArgumentParser(description='Walk-forward backtest of the Fatafat prediction model')
+    parser.add_argument('--days', type=int, default=365, help='days of sample history to replay')
+    parser.add_argument('--warmup', type=int, default=50, help='draws seen before scoring starts')
+    parser.add_argument('--workers', type=int, default=None, help='processes used for the weight sweep')
+    parser.add_argument('--no-sweep', action='store_true', help='only backtest the default weights')
+    parser.add_argument('--context-order', type=int, default=None, help='longest sequence context (3-6)')
+    args = parser.parse_args()
+
+    print("Kolkata Fatafat Walk-Forward Backtester")
+    print("=======================================")
+
+    sample = FatafatPredictor(historical_data=[])
+    sample.load_sample_data(days=args.days)
+    history = sample.historical_data
+    print(f"Replaying {len(history)} draws ({args.days} days)")
+
+    started = time.time()
+    baseline = WalkForwardBacktester(history, warmup=args.warmup, record_steps=False,
+                                     context_order=args.context_order).run()
+    print(f"Default weights: top-1 {baseline['top1_hit_rate']:.2%}, "
+          f"top-3 {baseline['top3_hit_rate']:.2%}, "
+          f"log-loss {baseline['mean_log_loss']:.4f} ({time.time() - started:.1f}s)")
+
+    if args.no_sweep:
+        return
+
+    configs = weight_grid(
+        frequency=[0.15, 0.25, 0.35, 0.5],
+        recent=[10, 20, 30],
+        single=[0.2, 0.3, 0.4],
+        pair=[0.15, 0.25],
+        triple=[0.2],
+    )
+    started = time.time()
+    results = run_weight_sweep(history, configs, warmup=args.warmup, workers=args.workers,
+                               context_order=args.context_order)
+    print(f"Swept {len(configs)} weight configs in {time.time() - started:.1f}s")
+    print("\nTop 5 configs by log-loss:")
+    for result in results[:5]:
+        swept = {name: result['weights'][name] for name in configs[0]}
+        print(f"  {swept}: top-1 {result['top1_hit_rate']:.2%}, "
+              f"top-3 {result['top3_hit_rate']:.2%}, log-loss {result['mean_log_loss']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
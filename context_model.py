@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Kolkata Fatafat Higher-Order Context Model
+==========================================
+
+Sparse next-number counts for contexts longer than the dense single, pair
+and triple tables in app.py (orders 4 up to MAX_CONTEXT_ORDER). A dense
+table would need 10^k rows for order k; here only contexts that actually
+occurred are stored, and rarely seen ones are pruned when the model grows
+past its budget.
+
+Features:
+- Hashed per-order count rows, updated one draw at a time
+- Vectorized bulk build from a result column
+- Backoff: longer contexts only count while the shorter ones are well supported
+- Count-based pruning under a fixed context budget, applied at fixed draw
+  boundaries so a bulk build and a draw-by-draw replay end up identical
+"""
+
+import numpy as np
+
+# Orders 1-3 live in the predictor's dense tables
+DENSE_ORDER = 3
+MAX_CONTEXT_ORDER = 6
+
+# Index of the row total in each count row
+TOTAL = 10
+
+
+class ContextModel:
+    def __init__(self, order=DENSE_ORDER, min_count=3, max_contexts=50000, prune_interval=1000):
+        if not DENSE_ORDER <= order <= MAX_CONTEXT_ORDER:
+            raise ValueError(f"Context order must be between {DENSE_ORDER} and {MAX_CONTEXT_ORDER}, got {order}")
+        self.order = order
+        self.min_count = min_count          # Observations a context needs before it is trusted
+        self.max_contexts = max_contexts    # Budget across all sparse orders
+        self.prune_interval = prune_interval  # The budget is enforced every this many draws
+        # order -> {context code: [count of 0, ..., count of 9, total]}
+        self.tables = {k: {} for k in range(DENSE_ORDER + 1, order + 1)}
+        self.size = 0
+        self.draws = 0                      # Draws folded in so far
+        self.prune_floor = 0                # Contexts seen this often or less were pruned last time
+
+    @staticmethod
+    def encode(digits):
+        code = 0
+        for digit in digits:
+            code = code * 10 + digit
+        return code
+
+    def update(self, recent, result):
+        """Count `result` after every sparse-order context ending at recent[-1]"""
+        for k, table in self.tables.items():
+            if len(recent) < k:
+                break
+            code = self.encode(recent[-k:])
+            row = table.get(code)
+            if row is None:
+                row = table[code] = [0] * (TOTAL + 1)
+                self.size += 1
+            row[result] += 1
+            row[TOTAL] += 1
+        self.draws += 1
+        self.prune_at_boundary()
+
+    def build(self, results):
+        """Fill an empty model from a whole result column
+        
+        Draws are counted one prune interval at a time, vectorized per order,
+        and the budget is enforced at the same boundaries update() uses, so
+        the tables match replaying the column through update().
+        """
+        results = np.asarray(results, dtype=np.int64)
+        for start in range(0, len(results), self.prune_interval):
+            end = min(len(results), start + self.prune_interval)
+            self.count_block(results, start, end)
+            self.draws += end - start
+            self.prune_at_boundary()
+
+    def count_block(self, results, start, end):
+        """Count the draws results[start:end], each after its preceding contexts"""
+        for k, table in self.tables.items():
+            targets = np.arange(max(start, k), end)
+            if not len(targets):
+                continue
+            codes = np.zeros(len(targets), dtype=np.int64)
+            for offset in range(k, -1, -1):
+                codes = codes * 10 + results[targets - offset]
+            unique, counts = np.unique(codes, return_counts=True)
+            for code, count in zip(unique.tolist(), counts.tolist()):
+                context, result = divmod(code, 10)
+                row = table.get(context)
+                if row is None:
+                    row = table[context] = [0] * (TOTAL + 1)
+                    self.size += 1
+                row[result] += count
+                row[TOTAL] += count
+
+    def prune_at_boundary(self):
+        if self.draws % self.prune_interval == 0 and self.size > self.max_contexts:
+            self.prune()
+
+    def prune(self):
+        """Drop the least supported contexts until the model is back well under budget"""
+        target = self.max_contexts * 3 // 4
+        self.prune_floor = 0
+        while self.size > target:
+            self.prune_floor += 1
+            for table in self.tables.values():
+                for code in [code for code, row in table.items() if row[TOTAL] <= self.prune_floor]:
+                    del table[code]
+            self.size = sum(len(table) for table in self.tables.values())
+
+    def rows(self, recent):
+        """Count rows for the sparse-order contexts of `recent`, backing off at the first weak one"""
+        rows = []
+        for k, table in self.tables.items():
+            if len(recent) < k:
+                break
+            row = table.get(self.encode(recent[-k:]))
+            # A longer context is seen no more often than this one, so stop here
+            if row is None or row[TOTAL] < self.min_count:
+                break
+            rows.append((k, row))
+        return rows
+
+    def get_stats(self):
+        return {
+            'order': self.order,
+            'contexts': {k: len(table) for k, table in self.tables.items()},
+            'prune_floor': self.prune_floor
+        }
+
+
+def check_build_matches_updates(results, order=MAX_CONTEXT_ORDER, **options):
+    """Whether build(results) gives the same model as folding update() over results"""
+    built = ContextModel(order, **options)
+    built.build(results)
+    folded = ContextModel(order, **options)
+    for index, result in enumerate(results):
+        folded.update(results[max(0, index - MAX_CONTEXT_ORDER):index], result)
+    return built.tables == folded.tables and built.size == folded.size, built.get_stats(), folded.get_stats()
+
+
+if __name__ == "__main__":
+    # Replay random draws under a tight budget so pruning runs many times
+    results = np.random.default_rng(0).integers(0, 10, size=22284).tolist()
+    for budget in (2000, 20000, 10 ** 7):
+        same, built, folded = check_build_matches_updates(results, max_contexts=budget)
+        print(f"{'PASS' if same else 'FAIL'}  budget {budget}: build {built['contexts']}, update {folded['contexts']}")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Kolkata Fatafat Draw History
+============================
+
+Compact, columnar storage for the predictor's draw history. Each draw is
+kept as three small integers (day ordinal, slot, result) in growable NumPy
+columns instead of a dict of strings, which cuts the per-draw footprint
+from hundreds of bytes to a few.
+
+Features:
+- Append-only columns with amortized growth
+- Weekday and announcement time derived from the day and slot codes
+- Dict views on access, so code reading entry['date'] etc. keeps working
+- Zero-copy column views for vectorized pattern building
+"""
+
+from datetime import date
+
+import numpy as np
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+class DrawHistory:
+    def __init__(self, entries=(), slot_times=(), capacity=1024):
+        self.slot_times = list(slot_times)  # Announcement time of slot 1, 2, ...
+        self._days = np.zeros(capacity, dtype=np.int32)
+        self._slots = np.zeros(capacity, dtype=np.int8)
+        self._results = np.zeros(capacity, dtype=np.int8)
+        self._size = 0
+        self.extend(entries)
+
+    def _reserve(self, size):
+        capacity = len(self._days)
+        if size <= capacity:
+            return
+        capacity = max(capacity, 1)
+        while capacity < size:
+            capacity *= 2
+        # Grow into new arrays; column views handed out earlier stay valid
+        for name in ('_days', '_slots', '_results'):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+
+    def append_draw(self, day, slot, result):
+        """Append one draw from its codes (day is a date or a proleptic ordinal)"""
+        self._reserve(self._size + 1)
+        index = self._size
+        self._days[index] = day.toordinal() if isinstance(day, date) else day
+        self._slots[index] = slot or 0
+        self._results[index] = result
+        # Publish the row only once it is fully written
+        self._size = index + 1
+
+    def append(self, entry):
+        """Append a draw given as a dict with 'date', 'draw' and 'result'"""
+        self.append_draw(date.fromisoformat(entry['date']), entry.get('draw'), entry['result'])
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    @property
+    def days(self):
+        return self._days[:self._size]
+
+    @property
+    def slots(self):
+        return self._slots[:self._size]
+
+    @property
+    def results(self):
+        return self._results[:self._size]
+
+    @property
+    def weekdays(self):
+        # Ordinal 1 (0001-01-01) was a Monday
+        return (self.days - 1) % 7
+
+    def entry(self, index):
+        """The draw at index as a dict in the legacy record format"""
+        day = date.fromordinal(int(self._days[index]))
+        slot = int(self._slots[index])
+        return {
+            'date': day.isoformat(),
+            'time': self.slot_times[slot - 1] if 0 < slot <= len(self.slot_times) else None,
+            'draw': slot,
+            'result': int(self._results[index]),
+            'day_of_week': WEEKDAY_NAMES[day.weekday()]
+        }
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.entry(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('draw index out of range')
+        return self.entry(index)
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self.entry(index)
+
+    def __getstate__(self):
+        # Pickle only the used rows (e.g. when shipped to sweep workers)
+        return {'slot_times': self.slot_times, 'days': self.days.copy(),
+                'slots': self.slots.copy(), 'results': self.results.copy()}
+
+    def __setstate__(self, state):
+        self.slot_times = state['slot_times']
+        self._days = state['days']
+        self._slots = state['slots']
+        self._results = state['results']
+        self._size = len(self._days)
+        self._reserve(self._size + 1)
+
+    def nbytes(self):
+        """Bytes allocated for the columns"""
+        return self._days.nbytes + self._slots.nbytes + self._results.nbytes
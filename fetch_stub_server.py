@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Kolkata Fatafat Fetch Fault-Injection Check
+===========================================
+
+Runs the scraper's ResilientFetcher against local stub servers that
+misbehave on purpose, so its retry, timeout and circuit-breaker behaviour
+can be reproduced without touching the real result sites. Uses only the
+standard library for the stubs.
+
+Sources:
+- dead:  nothing listening on the port (connection refused)
+- flaky: every other request answers 503
+- slow:  pages take 50ms, and /stall pages take several seconds
+
+Example:
+    python fetch_stub_server.py
+"""
+
+import argparse
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from kolkata_fatafat_fetch import ResilientFetcher
+
+PAGE = b"<html><body><table><tr><td>01-01-2024</td><td>5</td></tr></table></body></html>"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    mode = 'ok'
+    slow_delay = 0.05
+    stall_delay = 5.0
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            count = server.requests
+        try:
+            if self.mode == 'flaky' and count % 2 == 1:
+                self.send_error(503)
+                return
+            if self.mode == 'slow':
+                time.sleep(self.stall_delay if self.path.startswith('/stall') else self.slow_delay)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The fetcher gave up on a stalled request
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(mode):
+    handler = type(f"{mode.title()}Handler", (StubHandler,), {'mode': mode})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def dead_url():
+    """URL of a port that was just free, so connections are refused"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def check(name, condition, detail):
+    print(f"{'PASS' if condition else 'FAIL'}  {name}: {detail}")
+    return condition
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check ResilientFetcher against fault-injecting stub servers')
+    parser.add_argument('--pages', type=int, default=5, help='pages fetched from each source')
+    args = parser.parse_args()
+
+    flaky_server, flaky = start_stub('flaky')
+    slow_server, slow = start_stub('slow')
+    dead = dead_url()
+
+    fetcher = ResilientFetcher(max_retries=1, backoff_base=0.01, backoff_max=0.05,
+                               min_timeout=0.2, max_timeout=1.0, failure_threshold=3)
+    results = {}
+    timings = {}
+    for name, base, paths in (
+        ('dead', dead, [f"/chart{i}/" for i in range(args.pages)]),
+        ('flaky', flaky, [f"/chart{i}/" for i in range(args.pages)]),
+        ('slow', slow, [f"/chart{i}/" for i in range(args.pages)] + ['/stall/', '/after-stall/'])
+    ):
+        results[name] = []
+        for path in paths:
+            started = time.monotonic()
+            response = fetcher.fetch(base + path)
+            timings[(name, path)] = time.monotonic() - started
+            results[name].append(response is not None and response.status_code == 200)
+
+    health = {report['source']: report for report in fetcher.get_health_report()}
+    dead_health = health[dead.split('//')[1]]
+    flaky_health = health[flaky.split('//')[1]]
+    slow_health = health[slow.split('//')[1]]
+
+    print("\nSource health:")
+    for report in health.values():
+        print(f"  {report}")
+    print()
+
+    ok = all([
+        check('dead source', not any(results['dead']) and dead_health['circuit_open'],
+              f"circuit opened after {dead_health['failures']} failures, {dead_health['skipped']} fetches skipped"),
+        check('flaky source', all(results['flaky']) and flaky_health['failures'] > 0 and not flaky_health['circuit_open'],
+              f"{sum(results['flaky'])}/{len(results['flaky'])} pages fetched after {flaky_health['failures']} retried 503s"),
+        check('slow source', all(results['slow'][:args.pages]) and not results['slow'][args.pages]
+              and results['slow'][-1] and timings[('slow', '/stall/')] < StubHandler.stall_delay,
+              f"stalled page abandoned after {timings[('slow', '/stall/')]:.2f}s "
+              f"(adaptive timeout from {slow_health['avg_latency']}s latency), next page fetched"),
+    ])
+
+    flaky_server.shutdown()
+    slow_server.shutdown()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
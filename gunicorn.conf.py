@@ -0,0 +1,53 @@
+"""
+Gunicorn configuration for serving the Kolkata Fatafat app in production
+=======================================================================
+
+Worker model: a small number of preforked processes, each running a pool
+of threads (the "gthread" worker). Request handling is short and mostly
+reads a warmed pattern snapshot, so threads give cheap concurrency while
+idle keep-alive connections are parked in the worker's event loop instead
+of holding a thread.
+
+Every value can be overridden from the environment, e.g.
+    WEB_CONCURRENCY=4 GUNICORN_THREADS=16 gunicorn -c gunicorn.conf.py app:app
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Processes x threads. Default to two workers per core, capped for small dynos.
+workers = int(os.environ.get('WEB_CONCURRENCY', min(2 * multiprocessing.cpu_count(), 4)))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Open connections (active + keep-alive) each worker will accept
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 2000))
+
+# Polling clients reuse their connection between 30s refreshes
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 75))
+backlog = 2048
+
+timeout = 30
+graceful_timeout = 30
+
+# Load the app (and warm the predictor snapshot) once in the master so every
+# worker forks with it already in memory. On `kill -HUP <master>` or when a
+# worker is recycled, new workers fork from the warmed master instead of
+# recomputing, and in-flight requests finish on the old workers.
+preload_app = True
+
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 100000))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG')  # Off unless set ('-' for stdout)
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    # Threads don't survive fork, so each worker runs its own refresh scheduler
+    from app import refresh_scheduler
+    refresh_scheduler.start()
@@ -8,12 +8,16 @@ It scrapes data from multiple sources and provides comprehensive statistical ana
 
 Features:
 - Scrapes historical data from multiple years (2020-2025)
+- Retries, adaptive timeouts and circuit breaking per source
+- Normalizes and deduplicates rows merged from all sources
 - Analyzes number frequency patterns
 - Identifies hot and cold numbers
 - Calculates statistical trends
 - Generates visual charts and reports
+- Streams raw JSON Lines data in chunks for files larger than memory
 """
 
+import argparse
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
@@ -22,91 +26,310 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 import json
+import multiprocessing
+import os
+import queue
+import threading
 import time
 import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 from collections import Counter, defaultdict
 import warnings
+from kolkata_fatafat_fetch import ResilientFetcher
+from kolkata_fatafat_report import (
+    REPORT_FORMATS, AtomicFileWriter, ReportWriter, disclaimer_section, frequency_section,
+    insights_section, patterns_section, time_trends_section
+)
 warnings.filterwarnings('ignore')
 
+# Default output file names, written under the analyzer's output directory
+RAW_DATA_FILE = 'kolkata_fatafat_raw_data.jsonl'
+CHART_FILE = 'kolkata_fatafat_analysis.png'
+REPORT_FILE_STEM = 'kolkata_fatafat_analysis_report'
+
+DEFAULT_MARKET = 'kolkata_fatafat'
+
+# Per-year chart pages for each market, tried in order
+MARKET_URL_TEMPLATES = {
+    DEFAULT_MARKET: [
+        "https://kolkataff.in/chart{year}/",
+        "https://www.keralalotterytoday.com/2024/07/kolkata-fatafat-old-results-chart-{year}.html"
+    ]
+}
+
+# Pipeline stages, in the order they run
+STAGES = ('ingest', 'analyze', 'plot', 'report')
+
+# Result announcement time of each daily slot (slot 1 = 10:30)
+DRAW_TIMES = ["10:30", "12:00", "13:30", "15:00", "16:30", "18:00", "19:30", "21:00"]
+
+# Date layouts seen on chart pages, tried in order
+DATE_FORMATS = ['%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y', '%d %b %Y', '%d %B %Y', '%b %d, %Y', '%B %d, %Y']
+
+def parse_draw_date(text):
+    """Parse a scraped date into a date, or None"""
+    text = str(text).strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+def parse_draw_slot(record):
+    """Work out the daily slot (1-8) of a record from its draw number or time"""
+    draw_number = record.get('draw_number')
+    if isinstance(draw_number, int) and 1 <= draw_number <= len(DRAW_TIMES):
+        return draw_number
+    match = re.search(r'(\d{1,2})[:.](\d{2})\s*([AaPp][Mm])?', str(record.get('time', '')))
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2))
+    meridiem = (match.group(3) or '').lower()
+    if meridiem == 'pm' and hour < 12:
+        hour += 12
+    elif meridiem == 'am' and hour == 12:
+        hour = 0
+    time_text = f"{hour:02d}:{minute:02d}"
+    return DRAW_TIMES.index(time_text) + 1 if time_text in DRAW_TIMES else None
+
+def normalize_record(record, market=DEFAULT_MARKET):
+    """Return the record in canonical form, or None if it has no usable date, slot or result"""
+    date = parse_draw_date(record.get('date', ''))
+    slot = parse_draw_slot(record)
+    result = [str(num) for num in record.get('result') or [] if str(num).isdigit()]
+    if date is None or slot is None or not result:
+        return None
+    return {
+        'market': record.get('market', market),
+        'year': date.year,
+        'date': date.strftime('%Y-%m-%d'),
+        'time': DRAW_TIMES[slot - 1],
+        'draw_number': slot,
+        'result': result,
+        'source': record.get('source', 'unknown')
+    }
+
+class ResultIndex:
+    """Hash index on (market, date, slot) that dedups merged sources as rows arrive"""
+    
+    def __init__(self, market=DEFAULT_MARKET):
+        self.market = market
+        self.records = {}
+        self.stats = {'added': 0, 'invalid': 0, 'duplicates': 0, 'conflicts': 0}
+    
+    @staticmethod
+    def source_priority(record):
+        # Scraped rows beat generated samples; between scraped sources the first seen wins
+        return 0 if str(record['source']).startswith('generated') else 1
+    
+    def add(self, record):
+        """Normalize and index one raw row, returning False if it was dropped"""
+        normalized = normalize_record(record, self.market)
+        if normalized is None:
+            self.stats['invalid'] += 1
+            return False
+        
+        key = (normalized['market'], normalized['date'], normalized['draw_number'])
+        existing = self.records.get(key)
+        if existing is None:
+            self.records[key] = normalized
+            self.stats['added'] += 1
+            return True
+        
+        if existing['result'] == normalized['result']:
+            self.stats['duplicates'] += 1
+            return False
+        
+        # Same draw, different result: keep the more trusted source
+        self.stats['conflicts'] += 1
+        if self.source_priority(normalized) > self.source_priority(existing):
+            self.records[key] = normalized
+            return True
+        return False
+    
+    def extend(self, records):
+        for record in records:
+            self.add(record)
+    
+    def results(self):
+        """Indexed rows in chronological order"""
+        return [self.records[key] for key in sorted(self.records)]
+    
+    def dropped(self):
+        return self.stats['invalid'] + self.stats['duplicates'] + self.stats['conflicts']
+    
+    def __len__(self):
+        return len(self.records)
+
+def parse_results_page(content, year, url):
+    """Extract result rows from a chart page (module level so parser processes can run it)"""
+    soup = BeautifulSoup(content, 'html.parser')
+    yearly_results = []
+    
+    # Look for result tables or data
+    tables = soup.find_all('table')
+    for table in tables:
+        rows = table.find_all('tr')
+        for row in rows[1:]:  # Skip header
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 3:  # Date, time, result
+                try:
+                    date_text = cells[0].get_text().strip()
+                    time_text = cells[1].get_text().strip() if len(cells) > 1 else ""
+                    result_text = cells[2].get_text().strip() if len(cells) > 2 else ""
+                    
+                    # Parse result numbers
+                    numbers = re.findall(r'\d+', result_text)
+                    if numbers:
+                        yearly_results.append({
+                            'year': year,
+                            'date': date_text,
+                            'time': time_text,
+                            'result': numbers,
+                            'source': url
+                        })
+                except Exception as e:
+                    continue
+    
+    # Also look for div-based results
+    result_divs = soup.find_all('div', class_=re.compile(r'result|fatafat|ff'))
+    for div in result_divs:
+        text = div.get_text()
+        numbers = re.findall(r'\b\d{1,3}\b', text)
+        if len(numbers) >= 1:
+            yearly_results.append({
+                'year': year,
+                'date': f"{year}-01-01",  # Default date
+                'time': "unknown",
+                'result': numbers[:8],  # Max 8 results per day
+                'source': url
+            })
+    
+    return yearly_results
+
 class KolkataFatafatAnalyzer:
-    def __init__(self):
+    def __init__(self, output_dir='.', report_formats=('text',), market=DEFAULT_MARKET, parse_workers=None):
+        self.output_dir = output_dir
+        self.report_formats = tuple(report_formats)
+        self.market = market
+        self.parse_workers = parse_workers
         self.base_urls = {
             'kolkataff': 'https://kolkataff.in/',
             'kerala_lottery': 'https://www.keralalotterytoday.com/'
         }
         self.results_data = []
+        self.total_results = None  # Set when results are streamed instead of held in results_data
         self.analysis_results = {}
+        self._results_aggregates = None  # (results_data, its length, aggregates)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        self.fetcher = ResilientFetcher(self.session)
+        self.request_delay = 1  # Seconds each fetcher waits between requests
+        # Per-year chart pages, tried in order
+        self.yearly_url_templates = list(MARKET_URL_TEMPLATES.get(market, []))
+    
+    def output_path(self, filename):
+        """Resolve an output file name inside the configured output directory"""
+        return os.path.join(self.output_dir, filename)
     
     def scrape_yearly_results(self, year):
         """Scrape results for a specific year"""
-        print(f"Scraping results for year {year}...")
-        
-        # Try multiple sources for the year
-        urls_to_try = [
-            f"https://kolkataff.in/chart{year}/",
-            f"https://www.keralalotterytoday.com/2024/07/kolkata-fatafat-old-results-chart-{year}.html"
-        ]
-        
-        yearly_results = []
+        return self.scrape_years([year], fetch_workers=1)
+    
+    def scrape_years(self, years, fetch_workers=2, parse_workers=None, max_pending_pages=8):
+        """Scrape several years with network fetching and HTML parsing overlapped
+        
+        Fetcher threads download pages onto a bounded queue while a process
+        pool parses them. When the queue is full the fetchers block, so memory
+        stays bounded however far parsing falls behind. Each year's URLs are
+        tried in order and the next one is only fetched if the previous
+        produced no results.
+        """
+        templates = self.yearly_url_templates
+        if not templates:
+            return []
+        work = queue.Queue()
+        pages = queue.Queue(maxsize=max_pending_pages)
+        for year in years:
+            work.put((year, 0))
+        
+        def fetch_pages():
+            while True:
+                item = work.get()
+                if item is None:
+                    return
+                year, index = item
+                url = templates[index].format(year=year)
+                print(f"Scraping results for year {year} from {url}...")
+                content = None
+                try:
+                    response = self.fetcher.fetch(url)
+                    if response is not None and response.status_code == 200:
+                        content = response.content
+                except Exception as e:
+                    print(f"Error scraping {url}: {str(e)}")
+                pages.put((year, index, url, content))  # Blocks while parsers catch up
+                time.sleep(self.request_delay)  # Be respectful to servers
+        
+        fetchers = [threading.Thread(target=fetch_pages, daemon=True) for _ in range(fetch_workers)]
+        for thread in fetchers:
+            thread.start()
+        
+        results = {}
+        unresolved = set(years)
+        
+        def try_next_source(year, index):
+            if index + 1 < len(templates):
+                work.put((year, index + 1))
+            else:
+                results[year] = []
+                unresolved.discard(year)
         
-        for url in urls_to_try:
-            try:
-                response = self.session.get(url, timeout=10)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Look for result tables or data
-                    tables = soup.find_all('table')
-                    for table in tables:
-                        rows = table.find_all('tr')
-                        for row in rows[1:]:  # Skip header
-                            cells = row.find_all(['td', 'th'])
-                            if len(cells) >= 3:  # Date, time, result
-                                try:
-                                    date_text = cells[0].get_text().strip()
-                                    time_text = cells[1].get_text().strip() if len(cells) > 1 else ""
-                                    result_text = cells[2].get_text().strip() if len(cells) > 2 else ""
-                                    
-                                    # Parse result numbers
-                                    numbers = re.findall(r'\d+', result_text)
-                                    if numbers:
-                                        yearly_results.append({
-                                            'year': year,
-                                            'date': date_text,
-                                            'time': time_text,
-                                            'result': numbers,
-                                            'source': url
-                                        })
-                                except Exception as e:
-                                    continue
-                    
-                    # Also look for div-based results
-                    result_divs = soup.find_all('div', class_=re.compile(r'result|fatafat|ff'))
-                    for div in result_divs:
-                        text = div.get_text()
-                        numbers = re.findall(r'\b\d{1,3}\b', text)
-                        if len(numbers) >= 1:
-                            yearly_results.append({
-                                'year': year,
-                                'date': f"{year}-01-01",  # Default date
-                                'time': "unknown",
-                                'result': numbers[:8],  # Max 8 results per day
-                                'source': url
-                            })
+        try:
+            # The fetcher threads are already running, so forking could copy a
+            # lock one of them holds; forkserver children start clean
+            with ProcessPoolExecutor(max_workers=parse_workers,
+                                     mp_context=multiprocessing.get_context('forkserver')) as pool:
+                in_flight = {}
+                max_in_flight = max_pending_pages
+                while unresolved:
+                    try:
+                        year, index, url, content = pages.get(timeout=0.05)
+                        if content is None:
+                            try_next_source(year, index)
+                        else:
+                            in_flight[pool.submit(parse_results_page, content, year, url)] = (year, index, url)
+                    except queue.Empty:
+                        pass
                     
-                    if yearly_results:
-                        print(f"Found {len(yearly_results)} results from {url}")
-                        break
-                        
-            except Exception as e:
-                print(f"Error scraping {url}: {str(e)}")
-                continue
+                    # Only wait on parsers when too many pages are in flight
+                    if len(in_flight) >= max_in_flight:
+                        wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in [future for future in in_flight if future.done()]:
+                        year, index, url = in_flight.pop(future)
+                        try:
+                            rows = future.result()
+                        except Exception as e:
+                            print(f"Error parsing {url}: {str(e)}")
+                            rows = []
+                        if rows:
+                            print(f"Found {len(rows)} results from {url}")
+                            results[year] = rows
+                            unresolved.discard(year)
+                        else:
+                            try_next_source(year, index)
+        finally:
+            for _ in fetchers:
+                work.put(None)
         
-        return yearly_results
+        all_results = []
+        for year in years:
+            all_results.extend(results.get(year, []))
+        return all_results
     
     def generate_sample_data(self):
         """Generate sample historical data for analysis demonstration"""
@@ -152,53 +375,143 @@ class KolkataFatafatAnalyzer:
         print(f"Generated {len(sample_data)} sample result entries")
         return sample_data
     
-    def gather_all_results(self):
+    def gather_all_results(self, path=None):
         """Gather results from all available years"""
         print("Starting comprehensive data collection...")
+        if not self.yearly_url_templates:
+            raise ValueError(f"No result sources configured for market '{self.market}'")
         
-        all_results = []
+        index = ResultIndex(self.market)
         years = [2020, 2021, 2022, 2023, 2024, 2025]
         
-        # Try to scrape real data
-        for year in years:
-            yearly_data = self.scrape_yearly_results(year)
-            all_results.extend(yearly_data)
-            time.sleep(1)  # Be respectful to servers
+        # Try to scrape real data, fetching and parsing in parallel
+        index.extend(self.scrape_years(years, parse_workers=self.parse_workers))
         
         # If we don't have enough real data, supplement with sample data
-        if len(all_results) < 100:
+        if len(index) < 100:
             print("Limited real data found. Supplementing with sample data for analysis...")
             sample_data = self.generate_sample_data()
-            all_results.extend(sample_data)
+            index.extend(sample_data)
+        
+        all_results = index.results()
+        print(f"Normalized results: {len(all_results)} kept, {index.dropped()} dropped "
+              f"({index.stats['invalid']} invalid, {index.stats['duplicates']} duplicates, "
+              f"{index.stats['conflicts']} conflicts)")
+        
+        for health in self.fetcher.get_health_report():
+            print(f"Source {health['source']}: {health['successes']} ok, {health['failures']} failed, "
+                  f"{health['skipped']} skipped{' (circuit open)' if health['circuit_open'] else ''}")
         
         self.results_data = all_results
         print(f"Total results collected: {len(all_results)}")
         
-        # Save raw data
-        with open('kolkata_fatafat_raw_data.json', 'w') as f:
-            json.dump(all_results, f, indent=2)
+        # Save raw data as JSON Lines so it can be streamed back in chunks
+        with AtomicFileWriter(path or self.output_path(RAW_DATA_FILE)) as f:
+            for result in all_results:
+                f.write(json.dumps(result) + "\n")
         
         return all_results
     
-    def analyze_number_frequency(self):
-        """Analyze frequency of each number"""
-        print("Analyzing number frequencies...")
-        
-        all_numbers = []
-        for result in self.results_data:
-            if 'result' in result and result['result']:
-                for num in result['result']:
-                    try:
-                        all_numbers.append(int(num))
-                    except:
-                        continue
-        
-        if not all_numbers:
+    def parse_numbers(self, result):
+        """Return the integer numbers of a raw result record"""
+        numbers = []
+        if 'result' in result and result['result']:
+            for num in result['result']:
+                try:
+                    numbers.append(int(num))
+                except:
+                    continue
+        return numbers
+    
+    def new_aggregates(self):
+        """Create empty mergeable aggregates for all analyses"""
+        return {
+            'results': 0,
+            'frequency': Counter(),
+            'patterns': {
+                'consecutive_numbers': 0,
+                'repeated_numbers': 0,
+                'even_odd_distribution': {'even': 0, 'odd': 0},
+                'sum_ranges': defaultdict(int),
+                'digit_pairs': defaultdict(int)
+            },
+            # Per-year draw count, running sum and number counts
+            'yearly': defaultdict(lambda: {'count': 0, 'total': 0, 'numbers': Counter()})
+        }
+    
+    def update_aggregates(self, aggregates, records):
+        """Fold a chunk of raw records into the aggregates in a single pass"""
+        patterns = aggregates['patterns']
+        for result in records:
+            aggregates['results'] += 1
+            numbers = self.parse_numbers(result)
+            
+            # Number frequency
+            aggregates['frequency'].update(numbers)
+            
+            # Time trends
+            if 'result' in result and result['result'] and 'year' in result:
+                yearly = aggregates['yearly'][result['year']]
+                yearly['count'] += 1
+                yearly['total'] += sum(numbers)
+                yearly['numbers'].update(numbers)
+            
+            if not numbers:
+                continue
+            
+            # Even/Odd analysis
+            for num in numbers:
+                if num % 2 == 0:
+                    patterns['even_odd_distribution']['even'] += 1
+                else:
+                    patterns['even_odd_distribution']['odd'] += 1
+            
+            # Sum analysis
+            total_sum = sum(numbers)
+            sum_range = f"{(total_sum//10)*10}-{(total_sum//10)*10+9}"
+            patterns['sum_ranges'][sum_range] += 1
+            
+            # Consecutive numbers
+            if len(numbers) > 1:
+                sorted_nums = sorted(numbers)
+                for i in range(len(sorted_nums)-1):
+                    if sorted_nums[i+1] - sorted_nums[i] == 1:
+                        patterns['consecutive_numbers'] += 1
+            
+            # Repeated numbers in same draw
+            if len(numbers) != len(set(numbers)):
+                patterns['repeated_numbers'] += 1
+        return aggregates
+    
+    def merge_aggregates(self, target, other):
+        """Merge aggregates built from a later chunk (or another worker) into target"""
+        target['results'] += other['results']
+        target['frequency'].update(other['frequency'])
+        
+        patterns, other_patterns = target['patterns'], other['patterns']
+        patterns['consecutive_numbers'] += other_patterns['consecutive_numbers']
+        patterns['repeated_numbers'] += other_patterns['repeated_numbers']
+        for parity in ('even', 'odd'):
+            patterns['even_odd_distribution'][parity] += other_patterns['even_odd_distribution'][parity]
+        for key in ('sum_ranges', 'digit_pairs'):
+            for bucket, count in other_patterns[key].items():
+                patterns[key][bucket] += count
+        
+        for year, data in other['yearly'].items():
+            yearly = target['yearly'][year]
+            yearly['count'] += data['count']
+            yearly['total'] += data['total']
+            yearly['numbers'].update(data['numbers'])
+        return target
+    
+    def frequency_from_aggregates(self, aggregates):
+        """Analyze frequency of each number from the aggregates"""
+        frequency = aggregates['frequency']
+        if not frequency:
             print("No valid numbers found for analysis")
             return {}
         
-        frequency = Counter(all_numbers)
-        total_draws = len(all_numbers)
+        total_draws = sum(frequency.values())
         
         analysis = {
             'total_numbers_drawn': total_draws,
@@ -213,114 +526,101 @@ class KolkataFatafatAnalyzer:
         self.analysis_results['number_frequency'] = analysis
         return analysis
     
-    def analyze_patterns(self):
-        """Analyze various patterns in the results"""
-        print("Analyzing result patterns...")
-        
-        patterns = {
-            'consecutive_numbers': 0,
-            'repeated_numbers': 0,
-            'even_odd_distribution': {'even': 0, 'odd': 0},
-            'sum_ranges': defaultdict(int),
-            'digit_pairs': defaultdict(int)
-        }
-        
-        for result in self.results_data:
-            if 'result' in result and result['result']:
-                numbers = []
-                for num in result['result']:
-                    try:
-                        numbers.append(int(num))
-                    except:
-                        continue
-                
-                if not numbers:
-                    continue
-                
-                # Even/Odd analysis
-                for num in numbers:
-                    if num % 2 == 0:
-                        patterns['even_odd_distribution']['even'] += 1
-                    else:
-                        patterns['even_odd_distribution']['odd'] += 1
-                
-                # Sum analysis
-                total_sum = sum(numbers)
-                sum_range = f"{(total_sum//10)*10}-{(total_sum//10)*10+9}"
-                patterns['sum_ranges'][sum_range] += 1
-                
-                # Consecutive numbers
-                if len(numbers) > 1:
-                    sorted_nums = sorted(numbers)
-                    for i in range(len(sorted_nums)-1):
-                        if sorted_nums[i+1] - sorted_nums[i] == 1:
-                            patterns['consecutive_numbers'] += 1
-                
-                # Repeated numbers in same draw
-                if len(numbers) != len(set(numbers)):
-                    patterns['repeated_numbers'] += 1
-        
+    def patterns_from_aggregates(self, aggregates):
+        patterns = aggregates['patterns']
         self.analysis_results['patterns'] = patterns
         return patterns
     
-    def analyze_time_trends(self):
-        """Analyze trends over time"""
-        print("Analyzing time-based trends...")
-        
-        yearly_stats = defaultdict(lambda: {'count': 0, 'numbers': []})
-        monthly_stats = defaultdict(lambda: {'count': 0, 'numbers': []})
-        
-        for result in self.results_data:
-            if 'result' in result and result['result'] and 'year' in result:
-                year = result['year']
-                
-                # Extract month from date if available
-                month = 1  # default
-                if 'date' in result:
-                    try:
-                        if '-' in str(result['date']):
-                            month = int(str(result['date']).split('-')[1])
-                    except:
-                        pass
-                
-                numbers = []
-                for num in result['result']:
-                    try:
-                        numbers.append(int(num))
-                    except:
-                        continue
-                
-                yearly_stats[year]['count'] += 1
-                yearly_stats[year]['numbers'].extend(numbers)
-                
-                month_key = f"{year}-{month:02d}"
-                monthly_stats[month_key]['count'] += 1
-                monthly_stats[month_key]['numbers'].extend(numbers)
-        
-        # Calculate averages and trends
+    def time_trends_from_aggregates(self, aggregates):
+        """Summarize yearly trends from the aggregates"""
         trends = {
             'yearly_summary': {},
             'monthly_summary': {},
             'growth_trend': []
         }
         
-        for year, data in yearly_stats.items():
-            if data['numbers']:
+        for year, data in aggregates['yearly'].items():
+            count = sum(data['numbers'].values())
+            if count:
                 trends['yearly_summary'][year] = {
                     'total_draws': data['count'],
-                    'avg_number': np.mean(data['numbers']),
-                    'most_common': Counter(data['numbers']).most_common(3)
+                    'avg_number': data['total'] / count,
+                    'most_common': data['numbers'].most_common(3)
                 }
         
         self.analysis_results['time_trends'] = trends
         return trends
     
-    def generate_visualizations(self):
-        """Generate charts and visualizations"""
+    def results_aggregates(self):
+        """Aggregates over results_data, built in one pass and shared by all three analyses"""
+        cached = self._results_aggregates
+        if cached is None or cached[0] is not self.results_data or cached[1] != len(self.results_data):
+            cached = (self.results_data, len(self.results_data),
+                      self.update_aggregates(self.new_aggregates(), self.results_data))
+            self._results_aggregates = cached
+        return cached[2]
+    
+    def analyze_number_frequency(self):
+        """Analyze frequency of each number"""
+        print("Analyzing number frequencies...")
+        return self.frequency_from_aggregates(self.results_aggregates())
+    
+    def analyze_patterns(self):
+        """Analyze various patterns in the results"""
+        print("Analyzing result patterns...")
+        return self.patterns_from_aggregates(self.results_aggregates())
+    
+    def analyze_time_trends(self):
+        """Analyze trends over time"""
+        print("Analyzing time-based trends...")
+        return self.time_trends_from_aggregates(self.results_aggregates())
+    
+    def iter_raw_chunks(self, path, chunk_size=10000):
+        """Stream raw results from disk in chunks of at most chunk_size records"""
+        if not path.endswith('.jsonl'):
+            # Legacy pretty-printed JSON has to be loaded whole
+            with open(path) as f:
+                records = json.load(f)
+            for i in range(0, len(records), chunk_size):
+                yield records[i:i + chunk_size]
+            return
+        
+        chunk = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                chunk.append(json.loads(line))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+    
+    def analyze_raw_file(self, path=None, chunk_size=10000):
+        """Run all analyses over a raw data file in constant memory"""
+        path = path or self.output_path(RAW_DATA_FILE)
+        print(f"Streaming raw results from {path}...")
+        
+        aggregates = self.new_aggregates()
+        for chunk in self.iter_raw_chunks(path, chunk_size):
+            self.merge_aggregates(aggregates, self.update_aggregates(self.new_aggregates(), chunk))
+        
+        self.total_results = aggregates['results']
+        print(f"Analyzed {self.total_results} results")
+        
+        self.frequency_from_aggregates(aggregates)
+        self.patterns_from_aggregates(aggregates)
+        self.time_trends_from_aggregates(aggregates)
+        return self.analysis_results
+    
+    def generate_visualizations(self, show=True):
+        """Generate charts and visualizations, returning the chart path"""
         print("Generating visualizations...")
         
         if 'number_frequency' not in self.analysis_results:
-            return
+            return None
         
         # Set up the plotting style
         plt.style.use('seaborn-v0_8')
@@ -374,164 +674,190 @@ class KolkataFatafatAnalyzer:
                 axes[1, 1].grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig('kolkata_fatafat_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
-        
-        print("Visualizations saved as 'kolkata_fatafat_analysis.png'")
+        chart_path = self.output_path(CHART_FILE)
+        with AtomicFileWriter(chart_path, 'wb') as f:
+            plt.savefig(f, format='png', dpi=300, bbox_inches='tight')
+        if show:
+            plt.show()
+        plt.close(fig)
+        
+        print(f"Visualizations saved as '{chart_path}'")
+        return chart_path
+    
+    def open_report(self, formats=None):
+        """Open a streaming report writer for the configured output formats"""
+        return ReportWriter(self.output_path(REPORT_FILE_STEM), formats or self.report_formats,
+                            total_results=self.total_results if self.total_results is not None else len(self.results_data))
     
-    def generate_report(self):
+    def finish_report(self, report):
+        """Write the closing sections and move the report files into place"""
+        report.write_section(insights_section(self.analysis_results.get('number_frequency')))
+        report.write_section(disclaimer_section())
+        paths = report.close()
+        for path in paths.values():
+            print(f"Analysis report saved as '{path}'")
+        return paths
+    
+    def generate_report(self, formats=None):
         """Generate comprehensive analysis report"""
         print("Generating comprehensive analysis report...")
         
-        report = []
-        report.append("=" * 60)
-        report.append("KOLKATA FATAFAT HISTORICAL RESULTS ANALYSIS")
-        report.append("=" * 60)
-        report.append(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"Total Results Analyzed: {len(self.results_data)}")
-        report.append("")
-        
-        # Number Frequency Analysis
-        if 'number_frequency' in self.analysis_results:
-            freq_analysis = self.analysis_results['number_frequency']
-            report.append("NUMBER FREQUENCY ANALYSIS")
-            report.append("-" * 30)
-            report.append(f"Total Numbers Drawn: {freq_analysis['total_numbers_drawn']}")
-            report.append(f"Unique Numbers: {freq_analysis['unique_numbers']}")
-            report.append("")
-            
-            report.append("Most Frequent Numbers:")
-            for i, (num, count) in enumerate(freq_analysis['most_frequent'], 1):
-                percentage = (count / freq_analysis['total_numbers_drawn']) * 100
-                report.append(f"{i}. Number {num}: {count} times ({percentage:.2f}%)")
-            report.append("")
-            
-            report.append("Least Frequent Numbers:")
-            for i, (num, count) in enumerate(freq_analysis['least_frequent'], 1):
-                percentage = (count / freq_analysis['total_numbers_drawn']) * 100
-                report.append(f"{i}. Number {num}: {count} times ({percentage:.2f}%)")
-            report.append("")
-        
-        # Pattern Analysis
-        if 'patterns' in self.analysis_results:
-            patterns = self.analysis_results['patterns']
-            report.append("PATTERN ANALYSIS")
-            report.append("-" * 20)
-            
-            total_even = patterns['even_odd_distribution']['even']
-            total_odd = patterns['even_odd_distribution']['odd']
-            total_numbers = total_even + total_odd
-            
-            if total_numbers > 0:
-                report.append(f"Even Numbers: {total_even} ({(total_even/total_numbers)*100:.1f}%)")
-                report.append(f"Odd Numbers: {total_odd} ({(total_odd/total_numbers)*100:.1f}%)")
-            
-            report.append(f"Consecutive Numbers Found: {patterns['consecutive_numbers']}")
-            report.append(f"Repeated Numbers in Same Draw: {patterns['repeated_numbers']}")
-            report.append("")
-        
-        # Time Trends
-        if 'time_trends' in self.analysis_results:
-            trends = self.analysis_results['time_trends']
-            report.append("TIME-BASED TRENDS")
-            report.append("-" * 20)
-            
-            yearly_summary = trends['yearly_summary']
-            for year in sorted(yearly_summary.keys()):
-                data = yearly_summary[year]
-                report.append(f"Year {year}:")
-                report.append(f"  Total Draws: {data['total_draws']}")
-                report.append(f"  Average Number: {data['avg_number']:.2f}")
-                if data['most_common']:
-                    top_num, top_count = data['most_common'][0]
-                    report.append(f"  Most Common Number: {top_num} ({top_count} times)")
-                report.append("")
-        
-        # Recommendations
-        report.append("INSIGHTS AND RECOMMENDATIONS")
-        report.append("-" * 35)
-        
-        if 'number_frequency' in self.analysis_results:
-            freq_analysis = self.analysis_results['number_frequency']
-            if freq_analysis['most_frequent']:
-                hot_numbers = [str(num) for num, _ in freq_analysis['most_frequent'][:3]]
-                cold_numbers = [str(num) for num, _ in freq_analysis['least_frequent'][:3]]
-                
-                report.append(f"🔥 Hot Numbers (Most Frequent): {', '.join(hot_numbers)}")
-                report.append(f"❄️  Cold Numbers (Least Frequent): {', '.join(cold_numbers)}")
-                report.append("")
-        
-        report.append("⚠️  DISCLAIMER:")
-        report.append("This analysis is for educational purposes only.")
-        report.append("Past results do not guarantee future outcomes.")
-        report.append("Lottery games involve risk - play responsibly.")
-        report.append("")
-        
-        report_text = "\n".join(report)
-        
-        # Save report to file
-        with open('kolkata_fatafat_analysis_report.txt', 'w', encoding='utf-8') as f:
-            f.write(report_text)
-        
-        print("Analysis report saved as 'kolkata_fatafat_analysis_report.txt'")
-        return report_text
+        with self.open_report(formats) as report:
+            if 'number_frequency' in self.analysis_results:
+                report.write_section(frequency_section(self.analysis_results['number_frequency']))
+            if 'patterns' in self.analysis_results:
+                report.write_section(patterns_section(self.analysis_results['patterns']))
+            if 'time_trends' in self.analysis_results:
+                report.write_section(time_trends_section(self.analysis_results['time_trends']))
+            return self.finish_report(report)
     
     def run_complete_analysis(self):
         """Run the complete analysis pipeline"""
         print("Starting Kolkata Fatafat Historical Results Analysis")
         print("=" * 55)
         
-        try:
-            # Step 1: Gather all results
-            self.gather_all_results()
-            
-            # Step 2: Perform various analyses
-            self.analyze_number_frequency()
-            self.analyze_patterns()
-            self.analyze_time_trends()
+        # Step 1: Gather all results
+        self.gather_all_results()
+        
+        # Step 2: Perform various analyses, streaming each report section as it finishes
+        with self.open_report() as report:
+            frequency = self.analyze_number_frequency()
+            if frequency:
+                report.write_section(frequency_section(frequency))
+            report.write_section(patterns_section(self.analyze_patterns()))
+            report.write_section(time_trends_section(self.analyze_time_trends()))
             
             # Step 3: Generate visualizations
             self.generate_visualizations()
             
-            # Step 4: Generate comprehensive report
-            report = self.generate_report()
-            
-            print("\n" + "=" * 55)
-            print("ANALYSIS COMPLETE!")
-            print("=" * 55)
-            print("Files generated:")
-            print("- kolkata_fatafat_raw_data.json (Raw data)")
-            print("- kolkata_fatafat_analysis.png (Charts)")
-            print("- kolkata_fatafat_analysis_report.txt (Full report)")
-            print("\nAnalysis Summary:")
-            print("-" * 20)
-            
-            if 'number_frequency' in self.analysis_results:
-                freq_data = self.analysis_results['number_frequency']
-                print(f"Total numbers analyzed: {freq_data['total_numbers_drawn']}")
-                if freq_data['most_frequent']:
-                    top_num, top_count = freq_data['most_frequent'][0]
-                    print(f"Most frequent number: {top_num} ({top_count} times)")
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error during analysis: {str(e)}")
-            return False
+            # Step 4: Finish the comprehensive report
+            report_paths = self.finish_report(report)
+        
+        print("\n" + "=" * 55)
+        print("ANALYSIS COMPLETE!")
+        print("=" * 55)
+        print("Files generated:")
+        print(f"- {self.output_path(RAW_DATA_FILE)} (Raw data)")
+        print(f"- {self.output_path(CHART_FILE)} (Charts)")
+        for path in report_paths.values():
+            print(f"- {path} (Full report)")
+        self.print_summary()
+        return True
+    
+    def run_stages(self, stages=STAGES, input_path=None, show_plots=False):
+        """Run the selected pipeline stages, raising on the first failure
+        
+        Ingest writes the raw data to input_path (or the default raw file).
+        The other stages analyze that file in streamed chunks; plot and report
+        analyze it themselves when the analyze stage is not selected.
+        """
+        unknown = [stage for stage in stages if stage not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+        
+        raw_path = input_path or self.output_path(RAW_DATA_FILE)
+        written = []
+        if 'ingest' in stages:
+            self.gather_all_results(raw_path)
+            written.append(raw_path)
+        
+        if any(stage in stages for stage in ('analyze', 'plot', 'report')):
+            if not os.path.exists(raw_path):
+                raise FileNotFoundError(f"No raw data at '{raw_path}'; run the ingest stage first")
+            self.analyze_raw_file(raw_path)
+            if not self.total_results:
+                raise ValueError(f"No results to analyze in '{raw_path}'")
+        
+        if 'plot' in stages:
+            chart_path = self.generate_visualizations(show=show_plots)
+            if chart_path:
+                written.append(chart_path)
+        if 'report' in stages:
+            written.extend(self.generate_report().values())
+        
+        if 'analyze' in stages:
+            self.print_summary()
+        return written
+    
+    def print_summary(self):
+        print("\nAnalysis Summary:")
+        print("-" * 20)
+        
+        if 'number_frequency' in self.analysis_results:
+            freq_data = self.analysis_results['number_frequency']
+            print(f"Total numbers analyzed: {freq_data['total_numbers_drawn']}")
+            if freq_data['most_frequent']:
+                top_num, top_count = freq_data['most_frequent'][0]
+                print(f"Most frequent number: {top_num} ({top_count} times)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Kolkata Fatafat historical results analyzer')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES),
+                        help='pipeline stages to run (default: all)')
+    parser.add_argument('--input', default=None,
+                        help=f'raw JSON Lines file written by ingest and read by the other stages '
+                             f'(default: <output-dir>/{RAW_DATA_FILE}); may contain {{market}}')
+    parser.add_argument('--output-dir', default='.', help='directory for raw data, charts and reports')
+    parser.add_argument('--markets', nargs='+', default=[DEFAULT_MARKET],
+                        help='markets to process; several markets run in parallel, each in <output-dir>/<market>')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='processes for markets (or for page parsing with a single market)')
+    parser.add_argument('--formats', nargs='+', choices=sorted(REPORT_FORMATS), default=['text'],
+                        help='report formats to write')
+    parser.add_argument('--show', action='store_true', help='display the charts interactively')
+    args = parser.parse_args(argv)
+    
+    if len(args.markets) > 1 and args.input and '{market}' not in args.input:
+        parser.error("--input needs a {market} placeholder when processing several markets")
+    return args
 
-def main():
-    """Main function to run the analyzer"""
+def run_market(market, args, output_dir):
+    """Run the selected stages for one market, returning the files written"""
+    if not args.show:
+        plt.switch_backend('Agg')
+    # Markets already run in parallel processes; keep page parsing single-process there
+    parse_workers = args.workers if len(args.markets) == 1 else 1
+    analyzer = KolkataFatafatAnalyzer(output_dir=output_dir, report_formats=args.formats,
+                                      market=market, parse_workers=parse_workers)
+    input_path = args.input.format(market=market) if args.input else None
+    return analyzer.run_stages(args.stages, input_path=input_path, show_plots=args.show)
+
+def main(argv=None):
+    """Main function to run the analyzer; returns the process exit status"""
+    args = parse_args(argv)
     print("Kolkata Fatafat Historical Results Analyzer")
     print("==========================================")
     
-    analyzer = KolkataFatafatAnalyzer()
-    success = analyzer.run_complete_analysis()
+    if len(args.markets) == 1:
+        jobs = {args.markets[0]: args.output_dir}
+    else:
+        jobs = {market: os.path.join(args.output_dir, market) for market in args.markets}
     
-    if success:
-        print("\n✅ Analysis completed successfully!")
-        print("\nCheck the generated files for detailed results.")
+    written = {}
+    failures = {}
+    if len(jobs) == 1:
+        market, output_dir = next(iter(jobs.items()))
+        try:
+            written[market] = run_market(market, args, output_dir)
+        except Exception as e:
+            failures[market] = e
     else:
-        print("\n❌ Analysis failed. Please check the error messages above.")
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {pool.submit(run_market, market, args, output_dir): market
+                       for market, output_dir in jobs.items()}
+            for future in as_completed(futures):
+                market = futures[future]
+                try:
+                    written[market] = future.result()
+                except Exception as e:
+                    failures[market] = e
+    
+    for market in jobs:
+        if market in written:
+            print(f"\n✅ {market}: {', '.join(written[market]) or 'no files written'}")
+        else:
+            print(f"\n❌ {market} failed: {failures[market]}")
+    return 1 if failures else 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
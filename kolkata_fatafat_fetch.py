@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Kolkata Fatafat Fetch Layer
+===========================
+
+HTTP fetching for the scraper with per-source health tracking, so one slow
+or dead site cannot stall a whole collection run.
+
+Features:
+- Adaptive timeouts from each source's observed latency
+- Bounded retries with exponential backoff and jitter
+- Circuit breaker: a source that keeps failing is skipped immediately
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+# Status codes worth retrying; anything else is a definite answer from the source
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class SourceHealth:
+    """Latency and failure history for one source (host)"""
+
+    def __init__(self, name, initial_timeout):
+        self.name = name
+        self.latency = None          # Exponentially weighted average, seconds
+        self.initial_timeout = initial_timeout
+        self.consecutive_failures = 0
+        self.successes = 0
+        self.failures = 0
+        self.skipped = 0
+        self.opened_at = None        # When the circuit breaker tripped
+
+    def record_success(self, elapsed, smoothing=0.3):
+        self.latency = elapsed if self.latency is None else (1 - smoothing) * self.latency + smoothing * elapsed
+        self.consecutive_failures = 0
+        self.successes += 1
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.failures += 1
+
+    def get_summary(self):
+        return {
+            'source': self.name,
+            'successes': self.successes,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'avg_latency': round(self.latency, 3) if self.latency is not None else None,
+            'circuit_open': self.opened_at is not None
+        }
+
+
+class ResilientFetcher:
+    def __init__(self, session=None, max_retries=2, backoff_base=0.5, backoff_max=8.0,
+                 min_timeout=2.0, max_timeout=10.0, timeout_multiplier=4.0,
+                 failure_threshold=3, reset_timeout=None):
+        self.session = session or requests.Session()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout  # None keeps a tripped source off for the rest of the run
+        self.sources = {}
+        # Guards self.sources and every SourceHealth; never held during a request
+        self._lock = threading.Lock()
+
+    def source_for(self, url):
+        name = urlsplit(url).netloc
+        with self._lock:
+            if name not in self.sources:
+                self.sources[name] = SourceHealth(name, self.max_timeout)
+            return self.sources[name]
+
+    def timeout_for(self, health):
+        """Allow a multiple of the source's usual latency, within bounds"""
+        if health.latency is None:
+            return health.initial_timeout
+        return min(self.max_timeout, max(self.min_timeout, health.latency * self.timeout_multiplier))
+
+    def is_available(self, health):
+        if health.opened_at is None:
+            return True
+        if self.reset_timeout is not None and time.monotonic() - health.opened_at >= self.reset_timeout:
+            # Half-open: let one request through to probe the source
+            health.opened_at = None
+            health.consecutive_failures = self.failure_threshold - 1
+            return True
+        return False
+
+    def backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def fetch(self, url):
+        """GET url, returning the response or None if the source failed or is tripped"""
+        health = self.source_for(url)
+        for attempt in range(self.max_retries + 1):
+            with self._lock:
+                available = self.is_available(health)
+                if not available:
+                    health.skipped += 1
+                timeout = self.timeout_for(health)
+            if not available:
+                print(f"Skipping {url}: source {health.name} is unavailable")
+                return None
+
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, timeout=timeout)
+                if response.status_code not in RETRY_STATUSES:
+                    with self._lock:
+                        health.record_success(time.monotonic() - started)
+                    return response
+                error = f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                error = str(e)
+
+            with self._lock:
+                health.record_failure()
+                tripped = health.consecutive_failures >= self.failure_threshold
+                if tripped and health.opened_at is None:
+                    health.opened_at = time.monotonic()
+            if tripped:
+                print(f"Error fetching {url}: {error} - circuit opened for {health.name}")
+                return None
+            if attempt < self.max_retries:
+                delay = self.backoff(attempt)
+                print(f"Error fetching {url}: {error} - retrying in {delay:.1f}s")
+                time.sleep(delay)
+            else:
+                print(f"Error fetching {url}: {error} - giving up")
+        return None
+
+    def get_health_report(self):
+        with self._lock:
+            return [health.get_summary() for health in self.sources.values()]
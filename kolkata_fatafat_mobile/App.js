@@ -18,6 +18,41 @@ const {width, height} = Dimensions.get('window');
 
 // Configure your Flask server URL
 const API_BASE_URL = 'http://192.168.1.14:5000'; // Change this to your computer's IP
+// Optional: static snapshot directory (FATAFAT_STATIC_DIR) served from a CDN.
+// When set, predictions are read from it instead of the live API.
+const SNAPSHOT_BASE_URL = '';
+
+const loadDocument = async (name, manifest) => {
+  if (!SNAPSHOT_BASE_URL) {
+    return axios.get(`${API_BASE_URL}/api/${name}`);
+  }
+  // The manifest is small and always fresh; the files it names never change
+  const files = (await manifest).data.files;
+  const response = await axios.get(`${SNAPSHOT_BASE_URL}/${files[name]}`);
+  if (name === 'current-prediction' && response.data.success) {
+    response.data.prediction = withClockFields(response.data.prediction);
+  }
+  return response;
+};
+
+// Snapshots leave out everything that depends on the current time;
+// work out the live status and countdown from the draw's date and time
+const withClockFields = prediction => {
+  const target = new Date(`${prediction.draw_date}T${prediction.target_time}:00`);
+  const minutes = Math.ceil((target - Date.now()) / 60000);
+  const timeToNext =
+    minutes >= 60 ? `${Math.floor(minutes / 60)}h ${minutes % 60}m` : `${minutes}m`;
+  return {
+    ...prediction,
+    status: minutes > 0 ? 'NEXT ROUND' : 'LIVE NOW',
+    time_to_next: minutes > 0 ? timeToNext : null,
+  };
+};
+
+const loadManifest = () =>
+  SNAPSHOT_BASE_URL
+    ? axios.get(`${SNAPSHOT_BASE_URL}/manifest.json`, {headers: {'Cache-Control': 'no-cache'}})
+    : null;
 
 const App = () => {
   const [currentPrediction, setCurrentPrediction] = useState(null);
@@ -36,10 +71,11 @@ const App = () => {
 
   const loadAllData = async () => {
     try {
+      const manifest = loadManifest();
       await Promise.all([
-        loadCurrentPrediction(),
-        loadNumberWisePredictions(),
-        loadStatistics(),
+        loadCurrentPrediction(manifest),
+        loadNumberWisePredictions(manifest),
+        loadStatistics(manifest),
       ]);
     } catch (error) {
       console.error('Error loading data:', error);
@@ -50,9 +86,9 @@ const App = () => {
     }
   };
 
-  const loadCurrentPrediction = async () => {
+  const loadCurrentPrediction = async manifest => {
     try {
-      const response = await axios.get(`${API_BASE_URL}/api/current-prediction`);
+      const response = await loadDocument('current-prediction', manifest);
       if (response.data.success) {
         setCurrentPrediction(response.data.prediction);
       }
@@ -61,9 +97,9 @@ const App = () => {
     }
   };
 
-  const loadNumberWisePredictions = async () => {
+  const loadNumberWisePredictions = async manifest => {
     try {
-      const response = await axios.get(`${API_BASE_URL}/api/number-wise-predictions`);
+      const response = await loadDocument('number-wise-predictions', manifest);
       if (response.data.success) {
         setNumberWisePredictions(response.data.number_wise_predictions);
       }
@@ -72,9 +108,9 @@ const App = () => {
     }
   };
 
-  const loadStatistics = async () => {
+  const loadStatistics = async manifest => {
     try {
-      const response = await axios.get(`${API_BASE_URL}/api/statistics`);
+      const response = await loadDocument('statistics', manifest);
       if (response.data.success) {
         setStatistics(response.data.statistics);
       }
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Kolkata Fatafat Report Pipeline
+===============================
+
+Builds the analysis report as a stream of sections and renders each one as
+soon as it is available, so long reports start producing output right away
+and never have to be held in memory as a whole.
+
+Features:
+- One section builder per analysis, shared by every output format
+- Text, JSON and HTML renderers fed from the same sections
+- Atomic file writes (temp file + rename) so readers never see half a report
+"""
+
+import html
+import json
+import os
+import tempfile
+from datetime import datetime
+
+REPORT_FORMATS = {
+    'text': '.txt',
+    'json': '.json',
+    'html': '.html'
+}
+
+
+class ReportSection:
+    def __init__(self, key, title, body, data, rule=0):
+        self.key = key
+        self.title = title
+        self.body = body      # Lines of text under the title
+        self.data = data      # Structured form of the same content
+        self.rule = rule      # Width of the underline below the title (0 for none)
+
+
+def frequency_section(freq_analysis):
+    """Section for analyze_number_frequency results"""
+    body = [
+        f"Total Numbers Drawn: {freq_analysis['total_numbers_drawn']}",
+        f"Unique Numbers: {freq_analysis['unique_numbers']}",
+        ""
+    ]
+
+    body.append("Most Frequent Numbers:")
+    for i, (num, count) in enumerate(freq_analysis['most_frequent'], 1):
+        percentage = (count / freq_analysis['total_numbers_drawn']) * 100
+        body.append(f"{i}. Number {num}: {count} times ({percentage:.2f}%)")
+    body.append("")
+
+    body.append("Least Frequent Numbers:")
+    for i, (num, count) in enumerate(freq_analysis['least_frequent'], 1):
+        percentage = (count / freq_analysis['total_numbers_drawn']) * 100
+        body.append(f"{i}. Number {num}: {count} times ({percentage:.2f}%)")
+    body.append("")
+
+    return ReportSection('number_frequency', "NUMBER FREQUENCY ANALYSIS", body, freq_analysis, rule=30)
+
+
+def patterns_section(patterns):
+    """Section for analyze_patterns results"""
+    body = []
+    total_even = patterns['even_odd_distribution']['even']
+    total_odd = patterns['even_odd_distribution']['odd']
+    total_numbers = total_even + total_odd
+
+    if total_numbers > 0:
+        body.append(f"Even Numbers: {total_even} ({(total_even/total_numbers)*100:.1f}%)")
+        body.append(f"Odd Numbers: {total_odd} ({(total_odd/total_numbers)*100:.1f}%)")
+
+    body.append(f"Consecutive Numbers Found: {patterns['consecutive_numbers']}")
+    body.append(f"Repeated Numbers in Same Draw: {patterns['repeated_numbers']}")
+    body.append("")
+
+    return ReportSection('patterns', "PATTERN ANALYSIS", body, patterns, rule=20)
+
+
+def time_trends_section(trends):
+    """Section for analyze_time_trends results"""
+    body = []
+    yearly_summary = trends['yearly_summary']
+    for year in sorted(yearly_summary.keys()):
+        data = yearly_summary[year]
+        body.append(f"Year {year}:")
+        body.append(f"  Total Draws: {data['total_draws']}")
+        body.append(f"  Average Number: {data['avg_number']:.2f}")
+        if data['most_common']:
+            top_num, top_count = data['most_common'][0]
+            body.append(f"  Most Common Number: {top_num} ({top_count} times)")
+        body.append("")
+
+    return ReportSection('time_trends', "TIME-BASED TRENDS", body, trends, rule=20)
+
+
+def insights_section(freq_analysis):
+    """Hot/cold recommendations drawn from the frequency analysis"""
+    body = []
+    data = {}
+    if freq_analysis and freq_analysis['most_frequent']:
+        hot_numbers = [str(num) for num, _ in freq_analysis['most_frequent'][:3]]
+        cold_numbers = [str(num) for num, _ in freq_analysis['least_frequent'][:3]]
+        data = {'hot_numbers': hot_numbers, 'cold_numbers': cold_numbers}
+
+        body.append(f"🔥 Hot Numbers (Most Frequent): {', '.join(hot_numbers)}")
+        body.append(f"❄️  Cold Numbers (Least Frequent): {', '.join(cold_numbers)}")
+        body.append("")
+
+    return ReportSection('insights', "INSIGHTS AND RECOMMENDATIONS", body, data, rule=35)
+
+
+def disclaimer_section():
+    body = [
+        "This analysis is for educational purposes only.",
+        "Past results do not guarantee future outcomes.",
+        "Lottery games involve risk - play responsibly.",
+        ""
+    ]
+    return ReportSection('disclaimer', "⚠️  DISCLAIMER:", body, {'text': body[:-1]})
+
+
+def _json_default(value):
+    # NumPy scalars and tuples from Counter.most_common
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
+
+
+class TextReportRenderer:
+    # Lines are newline-separated rather than terminated, matching "\n".join()
+    def _line(self, out, line):
+        if self._started:
+            out.write("\n")
+        self._started = True
+        out.write(line)
+
+    def begin(self, out, header):
+        self._started = False
+        self._line(out, "=" * 60)
+        self._line(out, header['title'])
+        self._line(out, "=" * 60)
+        self._line(out, f"Analysis Date: {header['analysis_date']}")
+        self._line(out, f"Total Results Analyzed: {header['total_results']}")
+        self._line(out, "")
+
+    def section(self, out, section):
+        self._line(out, section.title)
+        if section.rule:
+            self._line(out, "-" * section.rule)
+        for line in section.body:
+            self._line(out, line)
+
+    def end(self, out):
+        pass
+
+
+class JSONReportRenderer:
+    def begin(self, out, header):
+        self._first = True
+        out.write(json.dumps(header, default=_json_default)[:-1])
+        out.write(', "sections": {')
+
+    def section(self, out, section):
+        if not self._first:
+            out.write(", ")
+        self._first = False
+        out.write(f"{json.dumps(section.key)}: {json.dumps(section.data, default=_json_default)}")
+
+    def end(self, out):
+        out.write("}}\n")
+
+
+class HTMLReportRenderer:
+    def begin(self, out, header):
+        title = html.escape(header['title'])
+        out.write("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n")
+        out.write(f"<title>{title}</title>\n</head>\n<body>\n")
+        out.write(f"<h1>{title}</h1>\n")
+        out.write(f"<p>Analysis Date: {html.escape(header['analysis_date'])}<br>\n")
+        out.write(f"Total Results Analyzed: {header['total_results']}</p>\n")
+
+    def section(self, out, section):
+        out.write(f"<section id=\"{html.escape(section.key)}\">\n")
+        out.write(f"<h2>{html.escape(section.title)}</h2>\n<pre>")
+        out.write("\n".join(html.escape(line) for line in section.body).rstrip("\n"))
+        out.write("</pre>\n</section>\n")
+
+    def end(self, out):
+        out.write("</body>\n</html>\n")
+
+
+RENDERERS = {
+    'text': TextReportRenderer,
+    'json': JSONReportRenderer,
+    'html': HTMLReportRenderer
+}
+
+
+class AtomicFileWriter:
+    """Write to a temp file next to the target and rename it into place on close"""
+
+    def __init__(self, path, mode='w', encoding='utf-8'):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+        self.file = os.fdopen(fd, mode, encoding=encoding if 'b' not in mode else None)
+
+    def write(self, text):
+        return self.file.write(text)
+
+    def flush(self):
+        self.file.flush()
+
+    def commit(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        # mkstemp creates the file 0600; give it the permissions open() would have
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(self.temp_path, 0o666 & ~umask)
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+
+class ReportWriter:
+    """Streams report sections to one file per output format"""
+
+    def __init__(self, path_stem, formats=('text',), total_results=0,
+                 title="KOLKATA FATAFAT HISTORICAL RESULTS ANALYSIS"):
+        unknown = [fmt for fmt in formats if fmt not in RENDERERS]
+        if unknown:
+            raise ValueError(f"Unknown report format(s): {', '.join(unknown)}")
+
+        self.paths = {fmt: path_stem + REPORT_FORMATS[fmt] for fmt in formats}
+        self.header = {
+            'title': title,
+            'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'total_results': total_results
+        }
+        self._outputs = []
+        try:
+            for fmt, path in self.paths.items():
+                renderer = RENDERERS[fmt]()
+                out = AtomicFileWriter(path)
+                self._outputs.append((renderer, out))
+                renderer.begin(out, self.header)
+        except Exception:
+            self.abort()
+            raise
+
+    def write_section(self, section):
+        for renderer, out in self._outputs:
+            renderer.section(out, section)
+            out.flush()
+
+    def close(self):
+        for renderer, out in self._outputs:
+            renderer.end(out)
+            out.commit()
+        self._outputs = []
+        return self.paths
+
+    def abort(self):
+        for _, out in self._outputs:
+            out.abort()
+        self._outputs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
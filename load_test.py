@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Kolkata Fatafat Polling Load Test
+=================================
+
+Simulates many mobile/web clients that each hold one keep-alive connection
+and poll the prediction API on an interval, like the front-ends do every
+30 seconds. Uses only the standard library (asyncio streams).
+
+Example:
+    gunicorn -c gunicorn.conf.py app:app &
+    python load_test.py --clients 3000 --interval 30 --duration 120
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+ENDPOINTS = ['/api/current-prediction', '/api/number-wise-predictions', '/api/statistics']
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.connects = 0
+
+    def summary(self, elapsed):
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return f"no successful requests, {self.errors} errors"
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        return (f"{len(latencies)} requests in {elapsed:.1f}s ({len(latencies) / elapsed:.1f} req/s), "
+                f"{self.errors} errors, {self.connects} connections, "
+                f"p50 {percentile(0.50):.1f}ms, p95 {percentile(0.95):.1f}ms, p99 {percentile(0.99):.1f}ms")
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response and return its status code"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed by server')
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value.strip())
+    await reader.readexactly(length)
+    return status
+
+
+async def polling_client(host, port, interval, deadline, stats):
+    reader = writer = None
+    # Spread clients over the interval so they don't all poll in lockstep
+    await asyncio.sleep(random.uniform(0, interval))
+    while time.monotonic() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+                stats.connects += 1
+            for path in ENDPOINTS:
+                started = time.monotonic()
+                request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode()
+                writer.write(request)
+                await writer.drain()
+                try:
+                    status = await read_response(reader)
+                except ConnectionError:
+                    # The server closed an idle keep-alive connection (e.g. a
+                    # recycled worker); reconnect and retry once like a browser
+                    writer.close()
+                    reader, writer = await asyncio.open_connection(host, port)
+                    stats.connects += 1
+                    writer.write(request)
+                    await writer.drain()
+                    status = await read_response(reader)
+                if status == 200:
+                    stats.latencies.append(time.monotonic() - started)
+                else:
+                    stats.errors += 1
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            stats.errors += 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+        await asyncio.sleep(interval)
+    if writer is not None:
+        writer.close()
+
+
+async def run_load_test(url, clients, interval, duration):
+    parts = urlsplit(url)
+    stats = LoadStats()
+    started = time.monotonic()
+    deadline = started + duration
+    await asyncio.gather(*(polling_client(parts.hostname, parts.port or 80, interval, deadline, stats)
+                           for _ in range(clients)))
+    return stats, time.monotonic() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Polling load test for the Fatafat prediction API')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='base URL of the running server')
+    parser.add_argument('--clients', type=int, default=1000, help='concurrent polling clients')
+    parser.add_argument('--interval', type=float, default=30, help='seconds between polls per client')
+    parser.add_argument('--duration', type=float, default=60, help='test length in seconds')
+    args = parser.parse_args()
+
+    print(f"Polling {args.url} with {args.clients} clients every {args.interval}s for {args.duration}s...")
+    stats, elapsed = asyncio.run(run_load_test(args.url, args.clients, args.interval, args.duration))
+    print(stats.summary(elapsed))
+
+
+if __name__ == "__main__":
+    main()
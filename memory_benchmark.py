@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Kolkata Fatafat Draw Memory Benchmark
+=====================================
+
+Measures, with tracemalloc, how many bytes each draw in the predictor's
+history costs as the legacy list of dicts and as a columnar DrawHistory,
+and how long a full pattern rebuild takes on each.
+
+Example:
+    python memory_benchmark.py --draws 1000000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import numpy as np
+
+from app import RESULT_ANNOUNCEMENT_TIMES, FatafatPredictor
+from draw_history import DrawHistory
+
+
+def sample_draws(count, seed=0):
+    """(day, slot, result) codes for `count` consecutive draws ending yesterday"""
+    days = []
+    slots = []
+    day = date.today() - timedelta(days=1)
+    while len(days) < count:
+        # 8 draws per day (4 on Sunday), like load_sample_data
+        for slot in range(4 if day.weekday() == 6 else 8, 0, -1):
+            days.append(day)
+            slots.append(slot)
+        day -= timedelta(days=1)
+    days.reverse()
+    slots.reverse()
+    results = np.random.default_rng(seed).integers(0, 10, size=count).tolist()
+    return list(zip(days[-count:], slots[-count:], results))
+
+
+def build_dicts(draws):
+    # The record format load_sample_data produced before DrawHistory
+    return [{
+        'date': day.strftime('%Y-%m-%d'),
+        'time': RESULT_ANNOUNCEMENT_TIMES[slot - 1],
+        'draw': slot,
+        'result': result,
+        'day_of_week': day.strftime('%A')
+    } for day, slot, result in draws]
+
+
+def build_columns(draws):
+    history = DrawHistory(slot_times=RESULT_ANNOUNCEMENT_TIMES)
+    for day, slot, result in draws:
+        history.append_draw(day, slot, result)
+    return history
+
+
+def measure(build, draws):
+    """Build the history under tracemalloc, returning it with the bytes it retains"""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    history = build(draws)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return history, retained
+
+
+def time_rebuild(history):
+    predictor = FatafatPredictor(historical_data=[])
+    predictor.historical_data = history
+    started = time.time()
+    predictor.build_patterns()
+    return time.time() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-draw memory of the legacy and columnar draw history')
+    parser.add_argument('--draws', type=int, default=1000000, help='number of draws to hold in memory')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the sample results')
+    args = parser.parse_args()
+
+    print("Kolkata Fatafat Draw Memory Benchmark")
+    print("=====================================")
+    draws = sample_draws(args.draws, args.seed)
+    print(f"{len(draws)} draws from {draws[0][0]} to {draws[-1][0]}")
+
+    legacy, legacy_bytes = measure(build_dicts, draws)
+    print(f"List of dicts:  {legacy_bytes / 2**20:8.1f} MiB ({legacy_bytes / len(draws):6.1f} bytes/draw)")
+    del legacy
+
+    columns, column_bytes = measure(build_columns, draws)
+    print(f"DrawHistory:    {column_bytes / 2**20:8.1f} MiB ({column_bytes / len(draws):6.1f} bytes/draw)")
+    print(f"Reduction:      {legacy_bytes / max(column_bytes, 1):.0f}x")
+
+    print(f"Pattern rebuild on DrawHistory: {time_rebuild(columns):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
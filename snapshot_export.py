@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Kolkata Fatafat Static Snapshot Export
+======================================
+
+Writes the predictor's current snapshot (prediction, number-wise scores,
+statistics and draw schedule) to a directory of static JSON files, so the
+web page and mobile apps can read it from any static file server or CDN
+without touching the Python process.
+
+Features:
+- Content-hashed file names: each file can be cached forever
+- A small manifest.json, always written last, that points at the current files
+- Files from the previous export are kept so in-flight readers never 404
+- Safe with several workers exporting to one directory: exports take a file
+  lock, and pruning follows the export history on disk
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+from kolkata_fatafat_report import AtomicFileWriter
+
+MANIFEST_FILE = 'manifest.json'
+HISTORY_FILE = 'exports.json'   # File sets of the recent exports, newest first
+LOCK_FILE = '.export.lock'
+
+# Names of the content-hashed documents, e.g. statistics.0123456789ab.json
+DOCUMENT_FILE = re.compile(r'[a-z-]+\.[0-9a-f]{12}\.json')
+
+
+def content_hash(body):
+    return hashlib.sha1(body).hexdigest()[:12]
+
+
+class StaticSnapshotExporter:
+    def __init__(self, directory, keep_exports=2):
+        self.directory = directory
+        self.keep_exports = keep_exports  # Exports whose files stay on disk, newest first
+        self.exports = 0
+        self.failures = 0
+        self.last_export = None
+        os.makedirs(directory, exist_ok=True)
+
+    def build_documents(self, predictor, schedule, now=None):
+        """The API payloads, keyed by the name clients look up in the manifest
+
+        Exports run right after an announcement, so they describe the next
+        undrawn slot. Fields that depend on the wall clock (current time,
+        countdown, live status) are left out; clients derive them from the
+        draw's date and time.
+        """
+        draw_at, draw_number = predictor.next_draw(now or datetime.now())
+        prediction = predictor.get_draw_prediction(draw_at, draw_number)
+        draw = {
+            'draw_date': prediction['draw_date'],
+            'target_time': prediction['target_time'],
+            'draw_number': draw_number
+        }
+        return {
+            'current-prediction': {'success': True, 'prediction': prediction},
+            'number-wise-predictions': {
+                'success': True,
+                'number_wise_predictions': prediction['number_wise_predictions'],
+                'draw': draw
+            },
+            'statistics': {'success': True, 'statistics': predictor.get_statistics()},
+            'schedule': dict({'success': True, 'result_times': list(schedule)}, **draw)
+        }
+
+    def write_document(self, name, payload):
+        body = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        filename = f"{name}.{content_hash(body)}.json"
+        path = os.path.join(self.directory, filename)
+        # Same content, same name: an identical file is already in place
+        if not os.path.exists(path):
+            with AtomicFileWriter(path, mode='wb') as out:
+                out.write(body)
+        return filename
+
+    @contextmanager
+    def export_lock(self):
+        """Exclusive lock on the directory, shared by every process exporting to it"""
+        with open(os.path.join(self.directory, LOCK_FILE), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def read_history(self):
+        try:
+            with open(os.path.join(self.directory, HISTORY_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def export(self, predictor, schedule=(), now=None):
+        """Write every document, then swap the manifest over to them"""
+        documents = self.build_documents(predictor, schedule, now)
+        with self.export_lock():
+            files = {name: self.write_document(name, payload) for name, payload in documents.items()}
+            manifest = {
+                'generated_at': datetime.now().isoformat(),
+                'snapshot_version': predictor.snapshot_version,
+                'files': files
+            }
+            with AtomicFileWriter(os.path.join(self.directory, MANIFEST_FILE)) as out:
+                out.write(json.dumps(manifest, indent=2, sort_keys=True))
+
+            # The history on disk covers exports from every process, not just this one
+            history = [sorted(files.values())] + self.read_history()
+            del history[self.keep_exports:]
+            with AtomicFileWriter(os.path.join(self.directory, HISTORY_FILE)) as out:
+                out.write(json.dumps(history))
+            self.prune(history)
+
+        self.exports += 1
+        self.last_export = datetime.now()
+        return manifest
+
+    def prune(self, history):
+        """Remove hashed documents no longer referenced by a recent export"""
+        referenced = set().union(*history)
+        for name in os.listdir(self.directory):
+            if DOCUMENT_FILE.fullmatch(name) and name not in referenced:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def get_stats(self):
+        return {
+            'directory': self.directory,
+            'exports': self.exports,
+            'failures': self.failures,
+            'last_export': self.last_export.isoformat() if self.last_export else None
+        }
+
+
+def exporter_from_environment():
+    """Build an exporter when FATAFAT_STATIC_DIR is set, otherwise None"""
+    directory = os.environ.get('FATAFAT_STATIC_DIR')
+    if not directory:
+        return None
+    return StaticSnapshotExporter(directory, keep_exports=int(os.environ.get('FATAFAT_STATIC_KEEP', 2)))